@@ -0,0 +1,50 @@
+"""
+Records `python -X importtime` for the main gssutils entry points.
+
+The raw importtime output of each is written to the output directory (default `import-times`), and
+a summary of the total import time and the slowest top level imports is printed.
+
+    python benchmark-imports.py [output directory]
+"""
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ENTRY_POINTS = {
+    "gssutils": "import gssutils",
+    "gssutils-utils": "from gssutils.utils import pathify",
+    "codelist-manager": "import gssutils.codelistmanager.main",
+    "infojson2csvqb": "import gssutils.csvcubedintegration.infojson2csvqb.entrypoint",
+    "gss-scrape": "import gssutils.scrapecli",
+    "gssutils-star": "from gssutils import *",
+}
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+out = Path(sys.argv[1] if len(sys.argv) > 1 else "import-times")
+out.mkdir(parents=True, exist_ok=True)
+
+for name, statement in ENTRY_POINTS.items():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+    )
+    (out / f"{name}.log").write_text(result.stderr)
+    if result.returncode != 0:
+        print(f"{name}: failed, see {out / f'{name}.log'}")
+        continue
+
+    timings = [IMPORT_TIME_LINE.match(line) for line in result.stderr.splitlines()]
+    timings = [m for m in timings if m is not None]
+    total_us = sum(int(m.group(1)) for m in timings)
+    # top level imports are the ones with the least indentation
+    top_level = sorted(
+        [m for m in timings if len(m.group(3)) == 1],
+        key=lambda m: int(m.group(2)),
+        reverse=True,
+    )[:5]
+    print(f"{name}: {total_us / 1000:.0f}ms ({statement})")
+    for m in top_level:
+        print(f"    {int(m.group(2)) / 1000:8.0f}ms  {m.group(4)}")
@@ -6,6 +6,18 @@ Feature: distribution downloading
     Then the sheet names contain [Contents, 1.1, 1.2, 1.3, Geography, SIC]
     And I can access excel_ref 'A4' in the '1.1' tab
 
+  Scenario: databaker with selected tabs
+    Given I scrape the page "https://www.ons.gov.uk/businessindustryandtrade/business/businessinnovation/datasets/foreigndirectinvestmentinvolvingukcompanies2013inwardtables"
+    And fetch the [SIC, 1.1] tabs as a databaker object
+    Then the sheet names are [1.1, SIC]
+    And I can access excel_ref 'A4' in the '1.1' tab
+
+  Scenario: lazily parsed databaker tabs
+    Given I scrape the page "https://www.ons.gov.uk/businessindustryandtrade/business/businessinnovation/datasets/foreigndirectinvestmentinvolvingukcompanies2013inwardtables"
+    And fetch the [SIC, 1.1] tabs as lazily parsed databaker tables
+    Then the sheet names are [1.1, SIC]
+    And I can access excel_ref 'A4' in the '1.1' tab
+
   Scenario: databaker with nrscotland XLSX
     Given I scrape the page "https://www.nrscotland.gov.uk/statistics-and-data/statistics/statistics-by-theme/migration/migration-statistics/migration-flows/migration-between-scotland-and-overseas"
     And select the distribution given by
@@ -94,4 +106,13 @@ Feature: distribution downloading
       | key       | value    |
       | mediaType | text/csv |
     And fetch the distribution as a pandas dataframe with encoding "Windows-1252"
-    Then the dataframe should have 75648 rows
\ No newline at end of file
+    Then the dataframe should have 75648 rows
+
+  Scenario: NHS Digital Open data CSV in chunks
+    Given I scrape the page "https://digital.nhs.uk/data-and-information/publications/statistical/adult-social-care-outcomes-framework-ascof"
+    When I select the latest dataset whose title starts with "Measures"
+    And select the distribution given by
+      | key       | value    |
+      | mediaType | text/csv |
+    And fetch the distribution as pandas dataframes of 10000 rows with encoding "Windows-1252"
+    Then there should be 8 dataframes with 75648 rows in total
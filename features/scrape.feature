@@ -311,6 +311,22 @@ Feature: Scrape dataset info
     And select the oldest "text/csv" distribution
     Then the data can be downloaded from "https://www.ons.gov.uk/file?uri=/businessindustryandtrade/internationaltrade/datasets/uktradeingoodsbyclassificationofproductbyactivity/current/previous/v3/mq10.csv"
 
+  Scenario: ONS scrape distribution versions concurrently
+    Given the 'ONS_SCRAPER_MAX_WORKERS' environment variable is '4'
+    And I scrape the page "https://www.ons.gov.uk/businessindustryandtrade/internationaltrade/datasets/uktradeingoodsbyclassificationofproductbyactivity"
+    And select the oldest "text/csv" distribution
+    Then the data can be downloaded from "https://www.ons.gov.uk/file?uri=/businessindustryandtrade/internationaltrade/datasets/uktradeingoodsbyclassificationofproductbyactivity/current/previous/v3/mq10.csv"
+    And the 'ONS_SCRAPER_MAX_WORKERS' environment variable is '1'
+
+  Scenario: Scrape ONS pages concurrently
+    Given I scrape the pages concurrently
+      | uri                                                                                                                                                      |
+      | https://www.ons.gov.uk/businessindustryandtrade/business/businessinnovation/datasets/foreigndirectinvestmentinvolvingukcompanies2013inwardtables        |
+      | https://www.ons.gov.uk/businessindustryandtrade/internationaltrade/datasets/regionalisedestimatesofukserviceexports                                      |
+    Then every page should have been scraped
+    And the concurrently scraped page "https://www.ons.gov.uk/businessindustryandtrade/business/businessinnovation/datasets/foreigndirectinvestmentinvolvingukcompanies2013inwardtables" should have the title "Foreign direct investment involving UK companies: inward"
+    And the concurrently scraped page "https://www.ons.gov.uk/businessindustryandtrade/internationaltrade/datasets/regionalisedestimatesofukserviceexports" should have the title "Regionalised estimates of UK service exports"
+
   Scenario: deal with ONS publication datetime as Europe/London date.
     Given I scrape the page "https://www.ons.gov.uk/peoplepopulationandcommunity/birthsdeathsandmarriages/deaths/datasets/deathsinvolvingcovid19inthecaresectorenglandandwales"
     Then the publication date should match "2020-07-03"
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 import ast
@@ -11,6 +12,7 @@ from csvcubed.models.cube import CatalogMetadata
 from nose.tools import *
 
 from gssutils import Scraper
+from gssutils.scrape import scrape_many
 from gssutils.metadata import DCTERMS, DCAT, RDFS, namespaces
 from gssutils.metadata.mimetype import Excel
 
@@ -31,6 +33,32 @@ def step_impl(context, uri):
         context.scraper = Scraper(uri, requests.Session())
 
 
+@given("I scrape the pages concurrently")
+def step_impl(context):
+    uris = [row[0] for row in context.table]
+
+    async def scrape_all():
+        return [result async for result in scrape_many(uris, concurrency=2, session=requests.Session())]
+
+    with vcr.use_cassette(
+        cassette(uris[0]),
+        record_mode=context.config.userdata.get("record_mode", DEFAULT_RECORD_MODE),
+    ):
+        context.scrapers = dict(asyncio.run(scrape_all()))
+
+
+@then("every page should have been scraped")
+def step_impl(context):
+    for uri, scraper in context.scrapers.items():
+        if not isinstance(scraper, Scraper):
+            raise AssertionError(f"Failed to scrape {uri}") from scraper
+
+
+@then('the concurrently scraped page "{uri}" should have the title "{title}"')
+def step_impl(context, uri, title):
+    assert_equal(context.scrapers[uri].title, title)
+
+
 @given('I use the testing seed "{file_name}"')
 def step_impl(context, file_name):
     feature_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
@@ -155,6 +183,38 @@ def step_impl(context):
         context.databaker = context.distribution.as_databaker(latest=True)
 
 
+@step("fetch the [{namelist}] tabs as a databaker object")
+def step_impl(context, namelist):
+    with vcr.use_cassette(
+        cassette(context.scraper.uri),
+        record_mode=context.config.userdata.get("record_mode", DEFAULT_RECORD_MODE),
+    ):
+        if not hasattr(context, "distribution"):
+            context.distribution = context.scraper.distribution(latest=True)
+        context.databaker = context.distribution.as_databaker(
+            sheets=[name.strip() for name in namelist.split(",")]
+        )
+
+
+@step("fetch the [{namelist}] tabs as lazily parsed databaker tables")
+def step_impl(context, namelist):
+    with vcr.use_cassette(
+        cassette(context.scraper.uri),
+        record_mode=context.config.userdata.get("record_mode", DEFAULT_RECORD_MODE),
+    ):
+        if not hasattr(context, "distribution"):
+            context.distribution = context.scraper.distribution(latest=True)
+        context.databaker = context.distribution.databaker_tabs(
+            sheets=[name.strip() for name in namelist.split(",")]
+        )
+
+
+@then("the sheet names are [{namelist}]")
+def step_impl(context, namelist):
+    names = [name.strip() for name in namelist.split(",")]
+    eq_(names, [tab.name for tab in context.databaker])
+
+
 @then("the sheet names contain [{namelist}]")
 def step_impl(context, namelist):
     names = [name.strip() for name in namelist.split(",")]
@@ -270,6 +330,25 @@ def step_impl(context, encoding):
         )
 
 
+@step(
+    'fetch the distribution as pandas dataframes of {chunksize:d} rows with encoding "{encoding}"'
+)
+def step_impl(context, chunksize, encoding):
+    with vcr.use_cassette(
+        cassette(context.scraper.uri),
+        record_mode=context.config.userdata.get("record_mode", DEFAULT_RECORD_MODE),
+    ):
+        context.chunks = list(
+            context.distribution.iter_pandas(chunksize=chunksize, encoding=encoding)
+        )
+
+
+@then("there should be {count:d} dataframes with {rows:d} rows in total")
+def step_impl(context, count, rows):
+    eq_(count, len(context.chunks))
+    eq_(rows, sum(len(chunk) for chunk in context.chunks))
+
+
 @then('the dataset landing page should be "{url}"')
 def step_impl(context, url):
     eq_(context.scraper.dataset.landingPage, url)
@@ -1,14 +1,67 @@
-from messytables import excel
-
-from gssutils.scrape import Scraper
-from gssutils.utils import pathify, is_interactive
-from gssutils.tracing.transform import TransformTrace
-from gssutils.refdata import *
-from gssutils.csvw.mapping import CSVWMapping
-from gssutils.csvw.codelistRDF import CSVCodelists
-from gssutils.transform.cubes import Cubes
-from databaker.framework import *
-import pandas as pd
-from gssutils.metadata.mimetype import Excel, ODS
-from gssutils.metadata import THEME
-from pathlib import Path
+"""
+The names notebooks and transforms have always used from `gssutils` are resolved lazily, on first
+access, so that importing a single submodule (or running one of the CLIs) doesn't pay the cost of
+importing databaker, messytables, pandas, rdflib and every scraper up front.
+
+`from gssutils import *` still brings in everything it always did.
+"""
+import importlib
+
+# name -> (module, attribute), where an attribute of None means the module itself
+_lazy_attributes = {
+    "excel": ("messytables.excel", None),
+    "Scraper": ("gssutils.scrape", "Scraper"),
+    "pathify": ("gssutils.utils", "pathify"),
+    "is_interactive": ("gssutils.utils", "is_interactive"),
+    "TransformTrace": ("gssutils.tracing.transform", "TransformTrace"),
+    "CSVWMapping": ("gssutils.csvw.mapping", "CSVWMapping"),
+    "CSVCodelists": ("gssutils.csvw.codelistRDF", "CSVCodelists"),
+    "Cubes": ("gssutils.transform.cubes", "Cubes"),
+    "pd": ("pandas", None),
+    "Excel": ("gssutils.metadata.mimetype", "Excel"),
+    "ODS": ("gssutils.metadata.mimetype", "ODS"),
+    "THEME": ("gssutils.metadata", "THEME"),
+    # star imported by notebooks that never imported them themselves
+    "json": ("json", None),
+    "logging": ("logging", None),
+    "os": ("os", None),
+    "Path": ("pathlib", "Path"),
+}
+
+# modules whose public names are all re-exported, as by `from module import *`
+_star_modules = ["gssutils.refdata", "databaker.framework"]
+
+
+def _public_names(module_name):
+    module = importlib.import_module(module_name)
+    if hasattr(module, "__all__"):
+        return list(module.__all__)
+    return [name for name in vars(module) if not name.startswith("_")]
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        module_name, attribute = _lazy_attributes[name]
+        module = importlib.import_module(module_name)
+        value = module if attribute is None else getattr(module, attribute)
+    elif name == "__all__":
+        value = sorted(
+            set(_lazy_attributes)
+            | {n for module_name in _star_modules for n in _public_names(module_name)}
+        )
+    elif name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    else:
+        for module_name in _star_modules:
+            module = importlib.import_module(module_name)
+            if name in _public_names(module_name):
+                value = getattr(module, name)
+                break
+        else:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
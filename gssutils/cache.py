@@ -0,0 +1,367 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlparse
+
+import msgpack
+from cachecontrol.cache import BaseCache
+from cachecontrol.caches.file_cache import FileCache
+
+DEFAULT_CACHE_DIR = ".cache"
+# Where session.BlobSerializer keeps large bodies, under the cache directory.
+BLOB_DIR = "blobs"
+# How session.BlobSerializer marks a record whose body is kept in a blob.
+BLOB_RECORD_PREFIX = b"cc=blob,"
+DEFAULT_PARSED_CACHE_MAX_SIZE = 1000 * 1000 * 1000  # 1GB
+# Chunks of an OData load fetched longer ago than this aren't resumed from, as they may be revised.
+DEFAULT_ODATA_RESUME_MAX_AGE = 24 * 60 * 60  # 1 day
+
+
+class SQLiteCache(BaseCache):
+    """
+    A single file HTTP cache for cachecontrol.
+
+    Entries are evicted least recently used first once the total size of the cached bodies goes
+    over max_size bytes, and an entry bigger than max_size on its own isn't stored at all. Entries
+    are treated as missing once older than the TTL for their host (or the default ttl). The
+    database runs in WAL mode with a busy timeout so several worker processes can share one cache
+    file.
+
+    Given the blob_dir of the session's BlobSerializer, the size of an entry includes the blob
+    holding its body, and a blob is deleted along with the last entry that refers to it.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        host_ttl: Optional[Dict[str, float]] = None,
+        blob_dir: Optional[Union[str, Path]] = None,
+    ):
+        self.path = Path(path)
+        self.blob_dir = Path(blob_dir) if blob_dir is not None else None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.host_ttl = host_ttl or {}
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(entries)")]
+        if "blob" not in columns:
+            # caches created before blobs were accounted for
+            conn.execute("ALTER TABLE entries ADD COLUMN blob TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_blob ON entries (blob)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections can't be shared between threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _ttl_for(self, key: str) -> Optional[float]:
+        return self.host_ttl.get(urlparse(key).hostname, self.ttl)
+
+    def get(self, key):
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, created FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, created = row
+        now = time.time()
+        ttl = self._ttl_for(key)
+        if ttl is not None and now - created > ttl:
+            self.delete(key)
+            return None
+        conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return value
+
+    def _blob_of(self, value: bytes) -> Optional[str]:
+        if self.blob_dir is None or not value.startswith(BLOB_RECORD_PREFIX):
+            return None
+        try:
+            return msgpack.loads(value[len(BLOB_RECORD_PREFIX):], raw=False).get("blob")
+        except ValueError:
+            return None
+
+    def set(self, key, value, expires=None):
+        size = len(value)
+        blob = self._blob_of(value)
+        if blob is not None:
+            try:
+                size += (self.blob_dir / blob).stat().st_size
+            except FileNotFoundError:
+                pass
+        conn = self._connection()
+        if self.max_size is not None and size > self.max_size:
+            # storing it would only evict everything else, itself included
+            logging.debug(f"Not caching {key}, {size} bytes is over the cache's max_size")
+            if blob is not None:
+                self._delete_unreferenced_blobs(conn, [blob])
+            return
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT blob FROM entries WHERE key = ?", (key,)).fetchone()
+            replaced = row[0] if row is not None else None
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed, blob) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), size, now, now, blob),
+            )
+            evicted_blobs = self._evict(conn) if self.max_size is not None else []
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if replaced is not None and replaced != blob:
+            evicted_blobs.append(replaced)
+        self._delete_unreferenced_blobs(conn, evicted_blobs)
+
+    def _evict(self, conn: sqlite3.Connection) -> List[str]:
+        """
+        Delete least recently used entries until the cache is within max_size, returning the blobs
+        they referred to.
+        """
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_size:
+            return []
+        excess = total - self.max_size
+        stale = []
+        blobs = []
+        for key, size, blob in conn.execute("SELECT key, size, blob FROM entries ORDER BY accessed"):
+            stale.append((key,))
+            if blob is not None:
+                blobs.append(blob)
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+        return blobs
+
+    def _delete_unreferenced_blobs(self, conn: sqlite3.Connection, blobs: List[str]):
+        # blobs are content addressed, so another entry may have the same body
+        for blob in set(blobs):
+            if conn.execute("SELECT 1 FROM entries WHERE blob = ? LIMIT 1", (blob,)).fetchone() is None:
+                (self.blob_dir / blob).unlink(missing_ok=True)
+
+    def delete(self, key):
+        conn = self._connection()
+        row = conn.execute("SELECT blob FROM entries WHERE key = ?", (key,)).fetchone()
+        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        if row is not None and row[0] is not None:
+            self._delete_unreferenced_blobs(conn, [row[0]])
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _env_number(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def _env_host_ttl(name: str) -> Optional[Dict[str, float]]:
+    # e.g. "www.ons.gov.uk=3600,api.beta.ons.gov.uk=600"
+    value = os.getenv(name)
+    if not value:
+        return None
+    host_ttl = {}
+    for item in value.split(","):
+        host, _, ttl = item.strip().partition("=")
+        if not host or not ttl:
+            raise ValueError(f'Expected {name} to be a list of "host=seconds", got "{value}".')
+        host_ttl[host] = float(ttl)
+    return host_ttl
+
+
+def create_cache(
+    backend: Optional[str] = None,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    host_ttl: Optional[Dict[str, float]] = None,
+) -> BaseCache:
+    """
+    Create the HTTP cache for a Scraper's session.
+
+    The backend is one of "file" (one file per url, the default) or "sqlite", and falls back to
+    the SCRAPER_CACHE env var so existing transforms can switch without code changes. The SQLite
+    backend also reads SCRAPER_CACHE_MAX_SIZE (bytes), SCRAPER_CACHE_TTL (seconds) and, unless
+    host_ttl is given, SCRAPER_CACHE_HOST_TTL as a comma separated list of host=seconds.
+    """
+    backend = backend or os.getenv("SCRAPER_CACHE", "file")
+    if backend == "file":
+        return FileCache(cache_dir)
+    elif backend == "sqlite":
+        max_size = _env_number("SCRAPER_CACHE_MAX_SIZE")
+        return SQLiteCache(
+            Path(cache_dir) / "cache.sqlite",
+            max_size=int(max_size) if max_size is not None else None,
+            ttl=_env_number("SCRAPER_CACHE_TTL"),
+            host_ttl=host_ttl if host_ttl is not None else _env_host_ttl("SCRAPER_CACHE_HOST_TTL"),
+            blob_dir=Path(cache_dir) / BLOB_DIR,
+        )
+    else:
+        raise ValueError(
+            f'Unknown scraper cache backend "{backend}", expected "file" or "sqlite".'
+        )
+
+
+class ParsedCache:
+    """
+    A directory of parsed distributions (DataFrames, or dicts of them by sheet name) pickled under
+    a key made from the hash of the downloaded body and the arguments it was loaded with, so that
+    an unchanged source isn't parsed again.
+
+    Entries are removed least recently used first once the directory is over max_size bytes. With
+    max_age, entries are treated as missing once written longer ago than that many seconds, however
+    recently they were used. Anything that can't be read back is treated as missing.
+    """
+
+    SUFFIX = ".pickle"
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.max_age = max_age
+
+    @staticmethod
+    def key(content_hash: str, loader: str, kwargs: dict) -> Optional[str]:
+        """
+        The key of what loader makes of the body with the given hash, or None if the kwargs can't
+        be written as JSON (functions, types and the like), which then shouldn't be cached.
+        """
+        try:
+            identity = json.dumps([content_hash, loader, kwargs], sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.path / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entry(key)
+        if self.max_age is not None:
+            try:
+                written = entry.stat().st_mtime
+            except FileNotFoundError:
+                return None
+            if time.time() - written > self.max_age:
+                entry.unlink(missing_ok=True)
+                return None
+        try:
+            with open(entry, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logging.warning(f"Ignoring unreadable parsed cache entry {entry}")
+            entry.unlink(missing_ok=True)
+            return None
+        if self.max_age is None:
+            os.utime(entry)  # mark as recently used, which would also reset its age
+        return value
+
+    def set(self, key: str, value: Any):
+        # write then rename, so other processes never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.path)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                pickle.dump(value, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._entry(key))
+        except Exception:
+            logging.warning(f"Unable to cache parsed {type(value).__name__}", exc_info=True)
+            Path(tmp_path).unlink(missing_ok=True)
+            return
+        if self.max_size is not None:
+            self._evict()
+
+    def delete(self, key: str):
+        self._entry(key).unlink(missing_ok=True)
+
+    def _evict(self):
+        entries = []
+        for entry in self.path.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        excess = sum(size for _, size, _ in entries) - self.max_size
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if excess <= 0:
+                break
+            entry.unlink(missing_ok=True)
+            excess -= size
+
+
+def _env_enabled(name: str, enabled: Optional[bool]) -> bool:
+    # an explicit enabled wins, otherwise opt in with the env var set to "on"
+    if enabled is None:
+        return os.getenv(name, "off") == "on"
+    return enabled
+
+
+def create_parsed_cache(
+    cache_dir: str = DEFAULT_CACHE_DIR, enabled: Optional[bool] = None
+) -> Optional[ParsedCache]:
+    """
+    Create the cache of parsed distributions under cache_dir, or None if it isn't enabled. It is
+    opt in, unless enabled is given it's only used when the PARSED_CACHE env var is "on". Its size
+    is limited to PARSED_CACHE_MAX_SIZE bytes, by default 1GB.
+    """
+    if not _env_enabled("PARSED_CACHE", enabled):
+        return None
+    max_size = _env_number("PARSED_CACHE_MAX_SIZE")
+    return ParsedCache(
+        Path(cache_dir) / "parsed",
+        max_size=int(max_size) if max_size is not None else DEFAULT_PARSED_CACHE_MAX_SIZE,
+    )
+
+
+def create_odata_progress(
+    cache_dir: str = DEFAULT_CACHE_DIR, enabled: Optional[bool] = None
+) -> Optional[ParsedCache]:
+    """
+    Create the store of the chunks an OData load has fetched so far, so that a failed load can be
+    resumed, or None if it isn't enabled. As with create_parsed_cache, it is opt in, with the
+    ODATA_RESUME env var. Chunks are only resumed from for ODATA_RESUME_MAX_AGE seconds, by default
+    a day, and the store is limited to ODATA_RESUME_MAX_SIZE bytes, by default 1GB.
+    """
+    if not _env_enabled("ODATA_RESUME", enabled):
+        return None
+    max_size = _env_number("ODATA_RESUME_MAX_SIZE")
+    max_age = _env_number("ODATA_RESUME_MAX_AGE")
+    return ParsedCache(
+        Path(cache_dir) / "odata-progress",
+        max_size=int(max_size) if max_size is not None else DEFAULT_PARSED_CACHE_MAX_SIZE,
+        max_age=max_age if max_age is not None else DEFAULT_ODATA_RESUME_MAX_AGE,
+    )
@@ -1,11 +1,10 @@
-import collections
+import collections.abc
 import html
 from enum import Enum
-from inspect import getmro
 
 from rdflib import RDFS, Literal, BNode, URIRef, RDF
 from rdflib.term import Identifier
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
 
 from gssutils.metadata import namespaces
 
@@ -30,6 +29,12 @@ class Resource:
         self._uri = URIRef(uri)
 
 
+class CompiledProperty(NamedTuple):
+    predicate: URIRef
+    status: Status
+    converter: Callable[[Any], Identifier]
+
+
 class Metadata(Resource):
 
     _core_properties = ['uri', '_uri', '_containing_graph', '_seed']
@@ -37,6 +42,32 @@ class Metadata(Resource):
         'label': (RDFS.label, Status.mandatory, lambda s: Literal(s, 'en')),
         'comment': (RDFS.comment, Status.mandatory, lambda s: Literal(s, 'en'))
     }
+    # Counts the properties set on any Metadata object, for indexes to tell when they're stale.
+    _revision = 0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compile_properties()
+
+    @classmethod
+    def _compile_properties(cls):
+        """
+        Resolve, once per class, the RDF types and property profiles that every instance is
+        described with, rather than on each call to quads() or get_property().
+        """
+        declared = getattr(cls, '_type', None)
+        if declared is None:
+            cls._rdf_types = ()
+        else:
+            cls._rdf_types = declared if type(declared) == tuple else (declared,)
+        cls._compiled_properties = {
+            local_name: CompiledProperty(*profile)
+            for local_name, profile in cls._properties_metadata.items()
+        }
+        by_predicate = {}
+        for local_name, compiled in cls._compiled_properties.items():
+            by_predicate.setdefault(compiled.predicate, []).append(local_name)
+        cls._properties_by_predicate = {p: tuple(names) for p, names in by_predicate.items()}
 
     def __init__(self):
         super().__init__()
@@ -58,27 +89,23 @@ class Metadata(Resource):
     def __setattr__(self, name, value):
         if name in self._properties_metadata:
             self.__dict__[name] = value
+            Metadata._revision += 1
         elif name in self._core_properties:
             super().__setattr__(name, value)
         else:
             raise AttributeError(f'Unknown attribute {name}')
 
     def get_unset(self):
-        for local_name, profile in self._properties_metadata.items():
-            prop, status, f = profile
+        for local_name, (prop, status, f) in self._compiled_properties.items():
             if status == Status.mandatory and local_name not in self.__dict__:
                 yield local_name
 
     def get_property(self, p):
         obs = []
-        for k in self._properties_metadata:
-            prop, status, f = self._properties_metadata[k]
-            if prop == p:
-                if isinstance(self.__dict__[k], list):
-                    objects = list(map(lambda x: f(x), self.__dict__[k]))
-                    obs.extend(objects)
-                else:
-                    obs.append(f(self.__dict__[k]))
+        for k in self._properties_by_predicate.get(p, ()):
+            if k not in self.__dict__:
+                continue
+            obs.extend(map(self._compiled_properties[k].converter, self._as_list(k)))
         if len(obs) == 0:
             return None
         elif len(obs) == 1:
@@ -86,39 +113,59 @@ class Metadata(Resource):
         else:
             return obs
 
-    def _as_list(self, local_name: str) -> List[str]:
-        return (lambda x: x if type(x) == list else [x])(self.__dict__[local_name])
+    def _as_list(self, local_name: str) -> Sequence:
+        value = self.__dict__[local_name]
+        # lists, and compact sequences such as dcat.DistributionTable
+        if isinstance(value, collections.abc.Sequence) and not isinstance(value, str):
+            return value
+        return [value]
+
+    def _set_properties(self) -> Iterator[Tuple[str, "CompiledProperty"]]:
+        """
+        The local name and compiled profile of each property set on this object.
+        """
+        compiled = self._compiled_properties
+        for local_name in self.__dict__:
+            if local_name in compiled:
+                yield local_name, compiled[local_name]
+
+    def quads(self, visited: Optional[Dict[int, "Metadata"]] = None) -> Iterator[Tuple[Identifier, URIRef, Identifier, Identifier]]:
+        """
+        The (subject, predicate, object, graph) statements describing this object and, recursively,
+        the Metadata objects it refers to. Each object is only described once, but the same
+        statement may still be yielded more than once.
+        """
+        if visited is None:
+            # objects are kept until the end, as rows materialised on the fly may reuse ids
+            visited = {}
+        if id(self) in visited:
+            return
+        visited[id(self)] = self
+        subject, graph = self._uri, self._containing_graph
+        for t in self._rdf_types:
+            yield subject, RDF.type, t, graph
+        for local_name, (prop, status, f) in self._set_properties():
+            for obj in self._as_list(local_name):
+                yield subject, prop, f(obj), graph
+                if isinstance(obj, Metadata):
+                    yield from obj.quads(visited)
 
     def add_to_dataset(self, dataset):
-        graph = dataset.graph(self._containing_graph)
-        for c in getmro(type(self)):
-            if hasattr(c, '_type'):
-                if type(c._type) == tuple:
-                    for t in c._type:
-                        graph.add((self._uri, RDF.type, t))
-                else:
-                    graph.add((self._uri, RDF.type, c._type))
-                break  # Only add the most specific declared type(s).
-        for local_name, profile in self._properties_metadata.items():
-            if local_name in self.__dict__:
-                prop, status, f = profile
-                v = self.__dict__[local_name]
-                for obj in self._as_list(local_name):
-                    graph.add((self._uri, prop, f(obj)))
-                    if isinstance(obj, Metadata):
-                        obj.add_to_dataset(dataset)
+        for s, p, o, g in self.quads():
+            dataset.graph(g).add((s, p, o))
 
     def _repr_html_(self):
         s = f'<h3>{type(self).__name__}</h3>\n<dl>'
-        for local_name, profile in self._properties_metadata.items():
-            if local_name in self.__dict__:
-                prop, status, f = profile
-                s = s + f'<dt>{html.escape(prop.n3(namespaces))}</dt>'
-                for obj in self._as_list(local_name):
-                    term = f(obj)
-                    if type(term) == URIRef:
-                        s = s + f'<dd><a href={str(term)}>{html.escape(term.n3())}</a></dd>\n'
-                    else:
-                        s = s + f'<dd>{html.escape(term.n3())}</dd>\n'
+        for local_name, (prop, status, f) in self._set_properties():
+            s = s + f'<dt>{html.escape(prop.n3(namespaces))}</dt>'
+            for obj in self._as_list(local_name):
+                term = f(obj)
+                if type(term) == URIRef:
+                    s = s + f'<dd><a href={str(term)}>{html.escape(term.n3())}</a></dd>\n'
+                else:
+                    s = s + f'<dd>{html.escape(term.n3())}</dd>\n'
         s = s + '</dl>'
-        return s
\ No newline at end of file
+        return s
+
+
+Metadata._compile_properties()
@@ -1,7 +1,11 @@
 
-from rdflib import URIRef, Literal, XSD
+import weakref
+from collections.abc import Sequence
+
+from rdflib import BNode, URIRef, Literal, XSD
 from rdflib.namespace import DCTERMS, FOAF
-from typing import Optional
+from rdflib.term import Identifier
+from typing import Dict, Iterable, Optional
 
 from gssutils.metadata import DCAT, PROV, ODRL
 from gssutils.metadata.base import Metadata, Status
@@ -51,7 +55,9 @@ class Dataset(Resource):
 
     def __setattr__(self, key, value):
         if key == 'distribution':
-            if type(value) == list:
+            if isinstance(value, DistributionTable):
+                value._set_graph(self._containing_graph)
+            elif type(value) == list:
                 for d in value:
                     d._containing_graph = self._containing_graph
             else:
@@ -123,4 +129,126 @@ class Distribution(Metadata, Downloadable):
             self.uri = value
         elif key == 'mediaType':
             self._mediaType = value
-        super().__setattr__(key, value)
\ No newline at end of file
+        super().__setattr__(key, value)
+
+_UNSET = object()
+# Set on every Distribution by its scraper, so kept once per table rather than once per row.
+_SHARED_ATTRIBUTES = ('_session', '_seed')
+
+
+class DistributionTable(Sequence):
+    """
+    A compact list of Distributions, for scrapers that find thousands of them.
+
+    Each attribute is held in a column, rather than in a Distribution object per row, and a row is
+    only materialised as a Distribution when it is accessed. Changes made to a materialised row, or
+    to a Distribution after it is appended, are written back to the columns once it is released.
+    A table can be assigned to Dataset.distribution, and filtered by Scraper.distribution(), in the
+    same way as a list of Distributions, and indexed without materialising any rows.
+    """
+
+    def __init__(self, scraper, distributions: Iterable[Distribution] = ()):
+        self._session = scraper.session
+        self._seed = scraper.seed
+        self._columns: Dict[str, list] = {}
+        self._length = 0
+        self._live: Dict[int, weakref.ref] = {}
+        self.extend(distributions)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('distribution index out of range')
+        distribution = self._live_row(index)
+        if distribution is None:
+            distribution = Distribution.__new__(Distribution)
+            distribution.__dict__.update(self._row(index), _session=self._session, _seed=self._seed)
+            self._track(index, distribution)
+        return distribution
+
+    def append(self, distribution: Distribution):
+        index = self._length
+        self._length += 1
+        self._store(index, distribution.__dict__)
+        self._track(index, distribution)
+
+    def extend(self, distributions: Iterable[Distribution]):
+        for distribution in distributions:
+            self.append(distribution)
+
+    def add(self, **properties):
+        """
+        Append a distribution with the given properties, without creating a Distribution object.
+        """
+        row = {'_uri': BNode(), '_containing_graph': BNode(), '_mediaType': None}
+        for name, value in properties.items():
+            if name not in Distribution._properties_metadata:
+                raise AttributeError(f'Unknown attribute {name}')
+            row[name] = value
+            if name == 'downloadURL':
+                row['_uri'] = URIRef(value)
+            elif name == 'mediaType':
+                row['_mediaType'] = value
+        index = self._length
+        self._length += 1
+        self._store(index, row)
+
+    def set_containing_graph(self, uri):
+        """
+        The graph URI which the triples of every distribution are to be stored in.
+        """
+        self._set_graph(URIRef(uri))
+
+    def _set_graph(self, graph: Identifier):
+        self._columns['_containing_graph'] = [graph] * self._length
+        for index in list(self._live):
+            distribution = self._live_row(index)
+            if distribution is not None:
+                distribution._containing_graph = graph
+
+    def column(self, name: str, missing=None) -> list:
+        """
+        The value of name for every row, or missing where it isn't set, without materialising any.
+        """
+        column = self._columns.get(name, [_UNSET] * self._length)
+        values = [missing if value is _UNSET else value for value in column]
+        for index in list(self._live):
+            distribution = self._live_row(index)
+            if distribution is not None:
+                values[index] = distribution.__dict__.get(name, missing)
+        return values
+
+    def _live_row(self, index: int) -> Optional[Distribution]:
+        ref = self._live.get(index)
+        return ref() if ref is not None else None
+
+    def _row(self, index: int) -> dict:
+        return {
+            name: column[index] for name, column in self._columns.items() if column[index] is not _UNSET
+        }
+
+    def _store(self, index: int, state: dict):
+        for name in state.keys() - self._columns.keys():
+            if name not in _SHARED_ATTRIBUTES:
+                self._columns[name] = [_UNSET] * self._length
+        for name, column in self._columns.items():
+            if len(column) < self._length:
+                column.append(_UNSET)
+            column[index] = state.get(name, _UNSET)
+
+    def _track(self, index: int, distribution: Distribution):
+        self._live[index] = weakref.ref(distribution)
+        # the finalizer holds the instance dict, not the instance, so it can write it back
+        finalizer = weakref.finalize(distribution, self._release, index, distribution.__dict__)
+        finalizer.atexit = False
+
+    def _release(self, index: int, state: dict):
+        if self._live_row(index) is None:
+            self._live.pop(index, None)
+        self._store(index, state)
@@ -0,0 +1,191 @@
+"""
+Lazily built indexes over a list of Metadata objects, such as a scraper's distributions or its
+catalog's datasets, for transforms that select from them many times over.
+
+A hash index is built for a field the first time it is filtered on, and a sorted index the first
+time it is filtered by range. Both are dropped as soon as any item in the list is added, removed,
+replaced or moved, or any metadata property is set.
+"""
+import operator
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from gssutils.metadata.base import Metadata
+from gssutils.metadata.dcat import DistributionTable
+
+MISSING = object()
+
+
+@dataclass(frozen=True)
+class Prefix:
+    """Filter for string values starting with prefix."""
+
+    prefix: str
+
+
+@dataclass(frozen=True)
+class Between:
+    """Filter for values in the inclusive range [start, end], either end of which may be open."""
+
+    start: Any = None
+    end: Any = None
+
+
+class MetadataIndex:
+    """
+    Index over the Metadata objects in things, queried with select().
+
+    Filters are given as field=value keyword arguments, where the value is one of:
+
+    * a Prefix or Between
+    * a compiled regular expression, matching the whole of the value
+    * a callable, applied to the value
+    * anything else, compared for equality
+
+    An object without a value for the field never matches.
+    """
+
+    def __init__(self, things: Sequence):
+        # a list is copied, so reordering or replacing its items doesn't move them under the index;
+        # a table's rows can only be appended to
+        self.things = things if isinstance(things, DistributionTable) else list(things)
+        self._length = len(things)
+        self._revision = Metadata._revision
+        self._values: Dict[str, List] = {}
+        self._hashed: Dict[str, Tuple[Dict[Hashable, List[int]], List[int]]] = {}
+        self._sorted: Dict[str, Tuple[List, List[int]]] = {}
+
+    def is_current(self, things: Sequence) -> bool:
+        """
+        Whether this still indexes things, holding the same objects in the same order, unchanged.
+        """
+        if len(things) != self._length or Metadata._revision != self._revision:
+            return False
+        if isinstance(self.things, DistributionTable):
+            return things is self.things
+        return not isinstance(things, DistributionTable) and all(map(operator.is_, things, self.things))
+
+    def select(self, **filters) -> "Selection":
+        positions: Optional[List[int]] = None
+        # cheapest first, so that predicates only see what's left
+        for field, condition in sorted(filters.items(), key=lambda f: callable(f[1])):
+            if positions is not None and len(positions) == 0:
+                break
+            positions = self._matching(field, condition, positions)
+        if positions is None:
+            positions = list(range(self._length))
+        return Selection(self, positions)
+
+    def latest(self, positions: List[int], field: str = "issued") -> Optional[int]:
+        """
+        Of the given positions, the one with the greatest value for field, earliest on a tie. None if
+        any of them have no value for it.
+        """
+        values = self._field_values(field)
+        if len(positions) == 0 or any(values[p] is MISSING for p in positions):
+            return None
+        # only the values compared, as those of other objects may not be comparable with them
+        latest = None
+        for position in sorted(positions):
+            if latest is None or values[position] > values[latest]:
+                latest = position
+        return latest
+
+    def _field_values(self, field: str) -> List:
+        if field not in self._values:
+            if isinstance(self.things, DistributionTable):
+                self._values[field] = self.things.column(field, MISSING)
+            else:
+                self._values[field] = [thing.__dict__.get(field, MISSING) for thing in self.things]
+        return self._values[field]
+
+    def _hash_index(self, field: str) -> Tuple[Dict[Hashable, List[int]], List[int]]:
+        if field not in self._hashed:
+            index: Dict[Hashable, List[int]] = {}
+            unhashable: List[int] = []
+            for position, value in enumerate(self._field_values(field)):
+                if value is MISSING:
+                    continue
+                if isinstance(value, Hashable):
+                    index.setdefault(value, []).append(position)
+                else:
+                    unhashable.append(position)
+            self._hashed[field] = (index, unhashable)
+        return self._hashed[field]
+
+    def _sorted_index(self, field: str) -> Tuple[List, List[int]]:
+        if field not in self._sorted:
+            values = self._field_values(field)
+            # ties are ordered latest position first, so the last of them is the earliest
+            ordered = sorted(
+                (p for p, v in enumerate(values) if v is not MISSING),
+                key=lambda p: (values[p], -p),
+            )
+            self._sorted[field] = ([values[p] for p in ordered], ordered)
+        return self._sorted[field]
+
+    def _matching(self, field: str, condition, within: Optional[List[int]]) -> List[int]:
+        if isinstance(condition, Between):
+            keys, ordered = self._sorted_index(field)
+            lo = 0 if condition.start is None else bisect_left(keys, condition.start)
+            hi = len(keys) if condition.end is None else bisect_right(keys, condition.end)
+            found = sorted(ordered[lo:hi])
+        elif isinstance(condition, (Prefix, re.Pattern)):
+            index, unhashable = self._hash_index(field)
+            if isinstance(condition, Prefix):
+                test = lambda v: isinstance(v, str) and v.startswith(condition.prefix)
+            else:
+                test = lambda v: isinstance(v, str) and condition.fullmatch(v) is not None
+            found = sorted(p for value, ps in index.items() if test(value) for p in ps)
+        elif callable(condition):
+            values = self._field_values(field)
+            candidates = range(self._length) if within is None else within
+            return [p for p in candidates if values[p] is not MISSING and condition(values[p])]
+        else:
+            index, unhashable = self._hash_index(field)
+            values = self._field_values(field)
+            found = list(index.get(condition, [])) if isinstance(condition, Hashable) else []
+            found.extend(p for p in unhashable if values[p] == condition)
+            found.sort()
+        if within is None:
+            return found
+        wanted = set(within)
+        return [p for p in found if p in wanted]
+
+
+class Selection(Sequence):
+    """
+    The objects matching a MetadataIndex.select(), in their original order, only looked up (and
+    for a DistributionTable, materialised) when accessed.
+    """
+
+    def __init__(self, index: MetadataIndex, positions: List[int]):
+        self.index = index
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.index.things[p] for p in self.positions[item]]
+        return self.index.things[self.positions[item]]
+
+    def where(self, **filters) -> "Selection":
+        """Narrow the selection with further filters."""
+        wanted = set(self.positions)
+        narrowed = self.index.select(**filters)
+        return Selection(self.index, [p for p in narrowed.positions if p in wanted])
+
+    def latest(self, field: str = "issued"):
+        """
+        The match with the greatest value for field, or the first match if any of them lack one, as
+        publishers tend to list the most recent first.
+        """
+        if len(self.positions) == 0:
+            return None
+        position = self.index.latest(self.positions, field)
+        return self.index.things[self.positions[0] if position is None else position]
@@ -0,0 +1,168 @@
+"""
+Writes the statements from Metadata.quads() straight out as N-Quads or TriG text, without building
+an rdflib Dataset and running its generic serializers, which is most of the time taken to write
+the metadata of catalogues with thousands of distributions.
+
+CatalogWriter streams the metadata of many scrapes into a single file, to be bulk loaded.
+"""
+import gzip
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import RDF, NamespaceManager
+from rdflib.term import Identifier
+
+from gssutils.metadata import DCAT
+
+Quad = Tuple[Identifier, URIRef, Identifier, Identifier]
+
+# Conservative, so that every prefixed name written is valid Turtle
+_LOCAL_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_\-]*")
+_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+
+
+def _unique(quads: Iterable[Quad]) -> List[Quad]:
+    # as rdflib does, keep one of each statement
+    seen = set()
+    unique = []
+    for quad in quads:
+        if quad not in seen:
+            seen.add(quad)
+            unique.append(quad)
+    return unique
+
+
+class _TermWriter:
+    def __init__(self, namespace_manager: Optional[NamespaceManager] = None):
+        self._prefixes: Dict[str, str] = {}
+        if namespace_manager is not None:
+            self._prefixes = {str(ns): prefix for prefix, ns in namespace_manager.namespaces()}
+        self.used: Dict[str, str] = {}
+
+    @property
+    def prefixes(self) -> Dict[str, str]:
+        return {prefix: namespace for namespace, prefix in self._prefixes.items()}
+
+    def uri(self, uri: str) -> str:
+        if self._prefixes:
+            split = max(uri.rfind("#"), uri.rfind("/")) + 1
+            namespace, local = uri[:split], uri[split:]
+            prefix = self._prefixes.get(namespace)
+            if prefix is not None and (local == "" or _LOCAL_NAME.fullmatch(local)):
+                self.used[prefix] = namespace
+                return f"{prefix}:{local}"
+        return f"<{uri}>"
+
+    def term(self, term: Identifier) -> str:
+        if isinstance(term, URIRef):
+            return self.uri(term)
+        elif isinstance(term, BNode):
+            return f"_:{term}"
+        elif isinstance(term, Literal):
+            quoted = f'"{str(term).translate(_ESCAPES)}"'
+            if term.language is not None:
+                return f"{quoted}@{term.language}"
+            elif term.datatype is not None:
+                return f"{quoted}^^{self.uri(term.datatype)}"
+            return quoted
+        raise ValueError(f"Unable to write {term!r}")
+
+
+def write_nquads(quads: Iterable[Quad]) -> str:
+    terms = _TermWriter()
+    return "".join(
+        f"{terms.term(s)} {terms.term(p)} {terms.term(o)} {terms.term(g)} .\n"
+        for s, p, o, g in _unique(quads)
+    )
+
+
+def _trig_graphs(terms: _TermWriter, quads: Iterable[Quad]) -> List[str]:
+    graphs: Dict[Identifier, List[str]] = {}
+    for s, p, o, g in quads:
+        graphs.setdefault(g, []).append(f"    {terms.term(s)} {terms.term(p)} {terms.term(o)} .\n")
+    body = []
+    for g, statements in graphs.items():
+        body.append(f"\n{terms.term(g)} {{\n")
+        body.extend(statements)
+        body.append("}\n")
+    return body
+
+
+def _prefix_declarations(prefixes: Dict[str, str]) -> List[str]:
+    return [f"@prefix {prefix}: <{ns}> .\n" for prefix, ns in sorted(prefixes.items())]
+
+
+def write_trig(quads: Iterable[Quad], namespace_manager: Optional[NamespaceManager] = None) -> str:
+    """
+    TriG with each graph's statements written one per line, using the prefixes bound in
+    namespace_manager where they give a valid prefixed name.
+    """
+    terms = _TermWriter(namespace_manager)
+    body = _trig_graphs(terms, _unique(quads))
+    return "".join(_prefix_declarations(terms.used) + body)
+
+
+class CatalogWriter:
+    """
+    Writes the catalog metadata of many scrapes to one N-Quads or TriG file, which a triple store
+    can bulk load far quicker than a TriG file per dataset. The format is taken from the file's
+    suffix, one of .nq or .trig, gzipped if followed by .gz.
+
+    The statements about the catalog itself are shared between scrapes, and only written once.
+    Only those are remembered between scrapes, so memory use doesn't grow with everything written.
+    A TriG file declares every prefix bound in namespace_manager up front.
+    """
+
+    def __init__(self, path: Union[str, Path], namespace_manager: Optional[NamespaceManager] = None):
+        path = Path(path)
+        suffixes = path.suffixes[-2:] if path.suffix == ".gz" else path.suffixes[-1:]
+        if len(suffixes) == 0 or suffixes[0] not in (".nq", ".trig"):
+            raise ValueError(f"Unable to tell whether to write N-Quads or TriG to {path}")
+        self.path = path
+        self.trig = suffixes[0] == ".trig"
+        self._terms = _TermWriter(namespace_manager if self.trig else None)
+        self._catalog_statements: Set[Quad] = set()
+        if path.suffix == ".gz":
+            self._file = gzip.open(path, "wt", encoding="utf-8")
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+        if self.trig:
+            self._file.writelines(_prefix_declarations(self._terms.prefixes))
+
+    def add(self, scraper, catalog_id=None):
+        """
+        Write the catalog record, dataset and distributions of the scraper, as they are now.
+        """
+        self.add_quads(scraper.catalog_quads(catalog_id))
+
+    def add_quads(self, quads: Iterable[Quad]):
+        """
+        Write the statements of one scrape.
+        """
+        quads = _unique(quads)
+        catalogs = {s for s, p, o, g in quads if p == RDF.type and o == DCAT.Catalog}
+        new = []
+        for quad in quads:
+            if quad[0] in catalogs:
+                if quad in self._catalog_statements:
+                    continue
+                self._catalog_statements.add(quad)
+            new.append(quad)
+        if self.trig:
+            self._file.writelines(_trig_graphs(self._terms, new))
+        else:
+            terms = self._terms
+            self._file.writelines(
+                f"{terms.term(s)} {terms.term(p)} {terms.term(o)} {terms.term(g)} .\n" for s, p, o, g in new
+            )
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
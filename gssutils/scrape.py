@@ -1,14 +1,16 @@
+import asyncio
+import hashlib
 import json
 import logging
 import os
+from concurrent.futures import Executor
 from datetime import datetime, timezone
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
 import html2text
-import msgpack
 import requests
-from cachecontrol import CacheControl, serialize
-from cachecontrol.caches.file_cache import FileCache
-from cachecontrol.heuristics import LastModified
+from cachecontrol.cache import BaseCache
 from dateutil.parser import parse
 from lxml import html
 from rdflib import BNode, URIRef
@@ -17,19 +19,16 @@ from csvcubed.models.cube.qb.catalog import CatalogMetadata
 
 import gssutils.scrapers
 from gssutils.metadata import namespaces, dcat, pmdcat, mimetype, GOV, GDP
+from gssutils.metadata.base import Metadata
+from gssutils.metadata.index import MetadataIndex, Selection
+from gssutils.metadata.quads import Quad, write_nquads, write_trig
+from gssutils.scrapers import ScraperInput
+from gssutils.session import BiggerSerializer, DownloadRecord, ScraperSession, get_session
 from gssutils.utils import pathify, ensure_list, recordable
 
 
-class BiggerSerializer(serialize.Serializer):
-    def _loads_v4(self, request, data):
-        try:
-            cached = msgpack.loads(
-                data, raw=False, max_bin_len=100 * 1000 * 1000
-            )  # 100MB
-        except ValueError:
-            return
-
-        return self.prepare_response(request, cached)
+# The distribution fields that make up the distributions hash of a Scraper.fingerprint()
+FINGERPRINT_FIELDS = ["title", "issued", "modified", "mediaType", "downloadURL"]
 
 
 class FilterError(Exception):
@@ -48,8 +47,19 @@ class MetadataError(Exception):
 
 class Scraper:
     def __init__(
-        self, uri: str = None, session: requests.Session = None, seed: str = None
+        self,
+        uri: str = None,
+        session: requests.Session = None,
+        seed: str = None,
+        cache: Optional[Union[str, BaseCache]] = None,
+        metrics_callback: Optional[Callable[[DownloadRecord], None]] = None,
     ):
+        """
+        :param cache: the HTTP cache to use when no session is given, either a cachecontrol cache or
+            the name of a backend ("file" or "sqlite"). Defaults to the SCRAPER_CACHE env var, then "file".
+        :param metrics_callback: called with the DownloadRecord of every request made by the scrape
+            and its distributions, once the body has been read. See also download_report().
+        """
 
         # Airtable and gssutils are using slightly different field names....
         self.meta_field_mapping = {"published": "issued"}
@@ -80,19 +90,16 @@ class Scraper:
         self.catalog = dcat.Catalog()
         self.dataset.modified = datetime.now(timezone.utc).astimezone()
         self.distributions = []
+        self._indexes: Dict[str, MetadataIndex] = {}
 
         if session:
-            self.session = session
+            self.session = ScraperSession(session, metrics_callback)
         elif "RECORD_MODE" in os.environ:
             # don't use cachecontrol, but we'll need to patch the session when used.
-            self.session = requests.Session()
+            self.session = ScraperSession(requests.Session(), metrics_callback)
         else:
-            self.session = CacheControl(
-                requests.Session(),
-                cache=FileCache(".cache"),
-                serializer=BiggerSerializer(),
-                heuristic=LastModified(),
-            )
+            # share connections and the http cache with every other Scraper in this process
+            self.session = ScraperSession(get_session(cache=cache), metrics_callback)
 
         if "JOB_NAME" in os.environ:
             self._base_uri = URIRef("http://gss-data.org.uk")
@@ -105,6 +112,17 @@ class Scraper:
             )
         self.update_dataset_uris()
         self._run()
+        # the fingerprint is of what the scrape saw, not of any later downloads
+        self.session.recording = False
+
+    @classmethod
+    async def create_async(cls, *args, executor: Optional[Executor] = None, **kwargs) -> "Scraper":
+        """
+        Create a Scraper without blocking the event loop, the scrape runs on the loop's executor.
+        Takes the same arguments as Scraper().
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(cls, *args, **kwargs))
 
     def _repr_markdown_(self):
         md = ""
@@ -170,22 +188,25 @@ class Scraper:
 
         # Using a standard scraper
         else:
-            page = self.session.get(self.uri)
-            # TODO - not all scrapers will necessarily need the beautified HTML DOM
-            tree = html.fromstring(page.text)
-
-            # Look for a scraper based on the uri
-            for start_uri, scrape in gssutils.scrapers.scraper_list:
-                if self.uri.startswith(start_uri):
+            # Look for a scraper based on the uri, the longest matching start uri wins
+            scrape = gssutils.scrapers.lookup(self.uri)
+            if scrape is not None:
+
+                # Only fetch and parse the landing page if the scraper is going to use it
+                scraper_input = gssutils.scrapers.required_input(scrape)
+                if scraper_input == ScraperInput.NOTHING:
+                    landing_page = None
+                else:
+                    landing_page = self.session.get(self.uri)
+                    if scraper_input == ScraperInput.TREE:
+                        landing_page = html.fromstring(landing_page.text)
 
-                    # Scrape
-                    scrape(self, tree)
-                    scraped = True
+                scrape(self, landing_page)
+                scraped = True
 
-                    # If we have a seed..
-                    if self.seed is not None:
-                        self._populate_missing_metadata()  # Plug any metadata gaps
-                    break
+                # If we have a seed..
+                if self.seed is not None:
+                    self._populate_missing_metadata()  # Plug any metadata gaps
 
         if not scraped:
             raise NotImplementedError(
@@ -355,27 +376,16 @@ class Scraper:
 
     @staticmethod
     def _filter_one(things, **kwargs):
-        latest = kwargs.pop("latest", False)
-        matches = [
-            d
-            for d in things
-            if all(
-                [
-                    v(d.__dict__[k])
-                    if callable(v)
-                    else (hasattr(d, k) and d.__dict__[k] == v)
-                    for k, v in kwargs.items()
-                ]
-            )
-        ]
+        return Scraper._one_of(MetadataIndex(things), **kwargs)
+
+    @staticmethod
+    def _one_of(index: MetadataIndex, latest: bool = False, **filters):
+        matches = index.select(**filters)
         if len(matches) > 1:
             if latest:
-                if len([d for d in matches if not hasattr(d, "issued")]) > 0:
-                    return matches[
-                        0
-                    ]  # assume the publisher lists distributions in order of most to least recent.
-                else:
-                    return max(matches, key=lambda d: d.issued)
+                # the first match where any have no issued date, assuming the publisher lists
+                # distributions in order of most to least recent.
+                return matches.latest()
             else:
                 raise FilterError("more than one match for given filter(s)")
         elif len(matches) == 0:
@@ -383,8 +393,33 @@ class Scraper:
         else:
             return matches[0]
 
+    def _index(self, name: str, things) -> MetadataIndex:
+        """
+        The index of things, a list of metadata or a single Metadata object (as a catalog with one
+        dataset has), kept as the index of name until things changes.
+        """
+        if isinstance(things, Metadata):
+            things = [things]
+        index = self._indexes.get(name)
+        if index is None or not index.is_current(things):
+            index = self._indexes[name] = MetadataIndex(things)
+        return index
+
+    def distributions_where(self, **filters) -> Selection:
+        """
+        Every distribution matching the filters, see gssutils.metadata.index.MetadataIndex for the
+        kinds of filter. The indexes used are kept between calls until the distributions change.
+        """
+        return self._index("distributions", self.distributions).select(**filters)
+
+    def datasets_where(self, **filters) -> Selection:
+        """
+        Every dataset in the catalog matching the filters, as for distributions_where().
+        """
+        return self._index("datasets", self.catalog.dataset).select(**filters)
+
     def select_dataset(self, **kwargs):
-        dataset = self._filter_one(self.catalog.dataset, **kwargs)
+        dataset = self._one_of(self._index("datasets", self.catalog.dataset), **kwargs)
         self.dataset = dataset
         self.dataset.landingPage = self.uri
         if not hasattr(self.dataset, "description") and hasattr(
@@ -396,7 +431,74 @@ class Scraper:
         self.distributions = dataset.distribution
 
     def distribution(self, **kwargs):
-        return self._filter_one(self.distributions, **kwargs)
+        return self._one_of(self._index("distributions", self.distributions), **kwargs)
+
+    def fingerprint(self) -> dict:
+        """
+        A compact, JSON serialisable record of this scrape: the validators (ETag and Last-Modified) of
+        each document fetched while scraping, and a hash of the distributions found. Keep it to pass
+        to has_changed_since() or sources_unchanged_since() on a later run.
+        """
+        distributions = sorted(
+            json.dumps(
+                {k: str(getattr(d, k)) for k in FINGERPRINT_FIELDS if hasattr(d, k)},
+                sort_keys=True,
+            )
+            for d in self.distributions
+        )
+        return {
+            "uri": self.uri,
+            "documents": dict(self.session.documents),
+            "distributions": hashlib.sha256(
+                "\n".join(distributions).encode("utf-8")
+            ).hexdigest(),
+        }
+
+    def has_changed_since(self, previous_state: Optional[dict]) -> bool:
+        """
+        Whether this scrape differs from the one previous_state was the fingerprint() of, either in
+        the distributions found or in the versions of the documents they were found in.
+        """
+        if previous_state is None:
+            return True
+        state = self.fingerprint()
+        return (
+            state["distributions"] != previous_state.get("distributions")
+            or state["documents"] != previous_state.get("documents")
+        )
+
+    @staticmethod
+    def sources_unchanged_since(previous_state: Optional[dict]) -> bool:
+        """
+        Ask the publisher whether any of the documents a previous scrape fetched have changed, with a
+        conditional GET for each, without scraping again. Only True if every document has validators
+        and comes back 304 Not Modified.
+
+        This deliberately doesn't go through the HTTP cache, whose own validators may be newer than
+        the ones in previous_state.
+        """
+        if previous_state is None or len(previous_state.get("documents", {})) == 0:
+            return False
+        with requests.Session() as session:
+            for url, validators in previous_state["documents"].items():
+                headers = {}
+                if "etag" in validators:
+                    headers["If-None-Match"] = validators["etag"]
+                if "last_modified" in validators:
+                    headers["If-Modified-Since"] = validators["last_modified"]
+                if len(headers) == 0:
+                    return False
+                with session.get(url, headers=headers, stream=True) as response:
+                    if response.status_code != 304:
+                        return False
+        return True
+
+    def download_report(self) -> dict:
+        """
+        The bytes, time taken, throughput and cache hit or miss of every request made by this scrape
+        and by loading its distributions so far, with totals.
+        """
+        return self.session.download_report()
 
     def set_base_uri(self, uri):
         self._base_uri = uri
@@ -444,7 +546,7 @@ class Scraper:
             public_contact_point_uri=getattr(self.dataset, "contactPoint", None),
         )
 
-    def as_quads(self, catalog_id=None):
+    def _prepare_catalog(self, catalog_id=None) -> dcat.Catalog:
         catalog = dcat.Catalog()
         if catalog_id is not None:
             catalog.uri = urljoin(self._base_uri, catalog_id)
@@ -464,8 +566,12 @@ class Scraper:
         catalog.record.primaryTopic = self.dataset
         # need to ensure that all the pointed to things are in the same graph
         if hasattr(catalog.record.primaryTopic, "distribution"):
-            for dist in ensure_list(catalog.record.primaryTopic.distribution):
-                dist.set_containing_graph(metadata_graph)
+            distributions = catalog.record.primaryTopic.distribution
+            if isinstance(distributions, dcat.DistributionTable):
+                distributions.set_containing_graph(metadata_graph)
+            else:
+                for dist in ensure_list(distributions):
+                    dist.set_containing_graph(metadata_graph)
         self.dataset.set_containing_graph(metadata_graph)
         self.dataset.datasetContents = pmdcat.DataCube()
         self.dataset.datasetContents.set_containing_graph(metadata_graph)
@@ -473,13 +579,27 @@ class Scraper:
             self._base_uri, f"data/{self._dataset_id}#dataset"
         )
         self.dataset.sparqlEndpoint = urljoin(self._base_uri, "/sparql")
+        return catalog
+
+    def as_quads(self, catalog_id=None):
         quads = RDFDataset()
         quads.namespace_manager = namespaces
-        catalog.add_to_dataset(quads)
+        self._prepare_catalog(catalog_id).add_to_dataset(quads)
         return quads
 
+    def catalog_quads(self, catalog_id=None) -> Iterator[Quad]:
+        """
+        The statements of the catalog record, dataset and distributions, as in as_quads(), but
+        without adding them to an rdflib Dataset. See also gssutils.metadata.quads.CatalogWriter.
+        """
+        return self._prepare_catalog(catalog_id).quads()
+
     def generate_trig(self, catalog_id=None) -> bytes:
-        return self.as_quads(catalog_id).serialize(format="trig", encoding="utf-8")
+        # written directly from the metadata, rather than through as_quads() and rdflib's serializer
+        return write_trig(self.catalog_quads(catalog_id), namespaces).encode("utf-8")
+
+    def generate_nquads(self, catalog_id=None) -> bytes:
+        return write_nquads(self.catalog_quads(catalog_id)).encode("utf-8")
 
     @property
     def title(self):
@@ -500,3 +620,26 @@ class Scraper:
     @property
     def contact(self):
         return self.dataset.contactPoint
+
+
+async def scrape_many(
+    uris: Iterable[str], concurrency: int = 4, **kwargs
+) -> AsyncIterator[Tuple[str, Union[Scraper, Exception]]]:
+    """
+    Scrape many landing pages in one event loop, with at most `concurrency` scrapes in flight.
+
+    Yields (uri, scraper) pairs in the order the scrapes finish. A scrape that fails yields its
+    exception in place of the scraper, so one bad landing page doesn't stop the rest. Any other
+    keyword arguments are passed to each Scraper.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _scrape(uri):
+        async with semaphore:
+            try:
+                return uri, await Scraper.create_async(uri, **kwargs)
+            except Exception as err:
+                return uri, err
+
+    for finished in asyncio.as_completed([_scrape(uri) for uri in uris]):
+        yield await finished
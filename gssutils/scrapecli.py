@@ -0,0 +1,233 @@
+"""
+CLI
+---
+
+The *Command Line Interface* for scraping many landing pages (or info.json seeds) in one long lived
+pool of workers, writing the TriG metadata of each (or of all of them to one file) and a JSON-lines
+summary of the lot.
+"""
+import hashlib
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlparse
+
+import click
+
+from gssutils.metadata import namespaces
+from gssutils.metadata.quads import CatalogWriter
+from gssutils.scrape import Scraper
+from gssutils.utils import pathify
+
+
+def _output_name(scraper: Scraper, source: str) -> str:
+    """
+    A file name for the scrape of source, readable but made unique by a hash of the source, as
+    different sources can have the same title (or seed id).
+    """
+    if scraper.seed is not None and "id" in scraper.seed:
+        name = pathify(scraper.seed["id"])
+    else:
+        name = pathify(urlparse(source).path.rstrip("/").rsplit("/", 1)[-1] or urlparse(source).netloc)
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:8]
+    return f"{name.replace('/', '-')}-{digest}"
+
+
+def scrape_one(
+    source: str,
+    out: Path,
+    previous_state: Optional[dict] = None,
+    only_changed: bool = False,
+    catalog: bool = False,
+) -> dict:
+    """
+    Scrape a single landing page URI or info.json seed, writing its TriG to `out`, and return a
+    summary of how it went. Never raises, a failure is reported in the summary's "error" field.
+
+    With catalog, the metadata's statements are returned in the summary's "quads" field for the
+    caller to write, rather than written to a TriG file.
+
+    With only_changed, a source whose documents all revalidate against previous_state (its last
+    Scraper.fingerprint()) isn't scraped at all, and one that scrapes the same as before has no
+    TriG written. Either way the summary is marked "unchanged".
+    """
+    summary = {"source": source}
+    scraper = None
+    start = time.perf_counter()
+    try:
+        if only_changed and Scraper.sources_unchanged_since(previous_state):
+            summary["unchanged"] = True
+            summary["state"] = previous_state
+            return summary
+
+        if source.endswith(".json") and Path(source).is_file():
+            scraper = Scraper(seed=source)
+        else:
+            scraper = Scraper(source)
+        summary["scrape_seconds"] = time.perf_counter() - start
+        summary["state"] = scraper.fingerprint()
+        summary["uri"] = scraper.uri
+        summary["title"] = getattr(scraper.dataset, "title", None)
+        summary["issued"] = getattr(scraper.dataset, "issued", None)
+        summary["distributions"] = [
+            {
+                key: getattr(distribution, key)
+                for key in ["title", "issued", "mediaType", "downloadURL"]
+                if hasattr(distribution, key)
+            }
+            for distribution in scraper.distributions
+        ]
+
+        if only_changed and not scraper.has_changed_since(previous_state):
+            summary["unchanged"] = True
+        elif catalog:
+            summary["quads"] = list(scraper.catalog_quads())
+        else:
+            trig_path = out / f"{_output_name(scraper, source)}.trig"
+            with open(trig_path, "wb") as trig_file:
+                trig_file.write(scraper.generate_trig())
+            summary["trig"] = str(trig_path)
+    except Exception as err:
+        logging.exception(f"Failed to scrape {source}")
+        summary["error"] = f"{type(err).__name__}: {err}"
+    finally:
+        summary["seconds"] = time.perf_counter() - start
+        # the requests made by the scrape itself, none if it never got going
+        report = scraper.download_report() if scraper is not None else None
+        summary["requests"] = report["requests"] if report is not None else 0
+        summary["cache_hits"] = report["cache_hits"] if report is not None else 0
+        summary["cache_hit_ratio"] = report["cache_hit_ratio"] if report is not None else None
+    return summary
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.option(
+    "--input",
+    "-i",
+    "input_file",
+    help="A file listing landing page URIs or info.json paths to scrape, one per line.",
+    type=click.File("r"),
+    required=False,
+)
+@click.option(
+    "--out",
+    "-o",
+    help="Location to write the TriG metadata of each scrape to.",
+    default="./out",
+    show_default=True,
+    type=click.Path(path_type=Path, file_okay=False, dir_okay=True),
+    metavar="OUT_DIR",
+)
+@click.option(
+    "--summary",
+    "-s",
+    help="File to write the JSON-lines summary to.",
+    default="-",
+    show_default=True,
+    type=click.File("w"),
+)
+@click.option(
+    "--workers",
+    "-w",
+    help="Number of scrapes to run at once.",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--threads/--processes",
+    help="Run the workers as threads in this process or as separate processes.",
+    default=False,
+    show_default=True,
+)
+@click.option(
+    "--state",
+    help="JSON file of the fingerprint of each source's last scrape, read if it exists and updated.",
+    type=click.Path(path_type=Path, file_okay=True, dir_okay=False),
+    required=False,
+    metavar="STATE_FILE",
+)
+@click.option(
+    "--only-changed",
+    help="Skip sources that haven't changed since the scrape recorded in the state file.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--catalog",
+    "-c",
+    help="Write the metadata of every scrape to this one N-Quads or TriG file (.nq, .trig, optionally"
+    " .gz) instead of a TriG file each.",
+    type=click.Path(path_type=Path, file_okay=True, dir_okay=False),
+    required=False,
+    metavar="CATALOG_FILE",
+)
+@click.argument("sources", nargs=-1, metavar="[URI_OR_INFO_JSON]...")
+def entry_point(
+    input_file,
+    out: Path,
+    summary,
+    workers: int,
+    threads: bool,
+    state: Optional[Path],
+    only_changed: bool,
+    catalog: Optional[Path],
+    sources: List[str],
+):
+    """
+    gss-scrape - scrape many landing pages or info.json seeds with one pool of workers.
+    """
+    sources = list(sources)
+    if input_file is not None:
+        sources.extend(line.strip() for line in input_file if line.strip())
+    if len(sources) == 0:
+        raise click.UsageError("Nothing to scrape, give some URIs or info.json files.")
+    if only_changed and state is None:
+        raise click.UsageError("--only-changed needs a --state file to compare against.")
+    if only_changed and catalog is not None:
+        # the catalog file is written afresh, so would be missing the unchanged sources
+        raise click.UsageError("--only-changed can't be used with --catalog.")
+
+    states = {}
+    if state is not None and state.exists():
+        with open(state, "r") as state_file:
+            states = json.load(state_file)
+
+    try:
+        catalog_writer = CatalogWriter(catalog, namespaces) if catalog is not None else None
+    except ValueError as err:
+        raise click.BadParameter(str(err), param_hint="--catalog")
+    out.mkdir(parents=True, exist_ok=True)
+    failures = 0
+    executor_class = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    with catalog_writer or nullcontext(), executor_class(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                scrape_one, source, out, states.get(source), only_changed, catalog is not None
+            )
+            for source in sources
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            if "error" in result:
+                failures += 1
+            if "state" in result:
+                states[result["source"]] = result.pop("state")
+            if "quads" in result:
+                catalog_writer.add_quads(result.pop("quads"))
+                result["catalog"] = str(catalog)
+            summary.write(json.dumps(result, default=str) + "\n")
+            summary.flush()
+
+    if state is not None:
+        with open(state, "w") as state_file:
+            json.dump(states, state_file, indent=2)
+
+    if failures > 0:
+        click.echo(f"{failures} of {len(sources)} scrapes failed.", err=True)
+        sys.exit(1)
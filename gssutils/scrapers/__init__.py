@@ -1,28 +1,194 @@
-from gssutils.scrapers import ons, onscmd, defra, govuk, nrscotland, nisra, hmrc, ni_govuk, isd_scotland, nhs_digital, statswales,\
-    govscot, dcni, govwales, lcc
-
-scraper_list = [
-    ('https://api.beta.ons.gov.uk', onscmd.scrape),
-    ('https://www.ons.gov.uk/', ons.scrape),
-    ('https://www.gov.uk/government/', govuk.content_api),
-    ('https://www.ethnicity-facts-figures.service.gov.uk/', govuk.eth_facts_service),
-    ('https://www.nrscotland.gov.uk/statistics-and-data/statistics/', nrscotland.statistics_handler),
-    ('https://www.nrscotland.gov.uk/covid19stats', nrscotland.covid_handler),
-    ('https://www.nisra.gov.uk/publications/', nisra.scrape),
-    ('https://www.uktradeinfo.com/Statistics/Pages/', hmrc.scrape_pages),
+"""
+The registry of scrapers, mapping the start of a landing page URI to the function that scrapes it.
+
+Scraper modules are only imported when a URI they handle is first scraped. A URI is handled by the
+scraper registered with the longest matching prefix.
+
+A scraper function is called with the Scraper and the landing page, by default parsed as an lxml
+HTML tree. Scrapers that make their own requests can say they need less with @requires, so the
+landing page isn't fetched and parsed for nothing.
+
+Scrapers added to `scraper_list` after import are registered too, though removing one from the list
+doesn't unregister it. Out-of-tree scrapers can register themselves through the `gssutils.scrapers` entry point group, each
+entry point referring to a list of (start_uri, scraper) pairs in the same form as `scraper_list`.
+"""
+import importlib
+import logging
+import threading
+from enum import Enum
+from importlib.metadata import entry_points
+from typing import Callable, Optional, Union
+
+ENTRY_POINT_GROUP = "gssutils.scrapers"
+
+
+class ScraperInput(Enum):
+    """
+    What a scraper function needs passed as the landing page.
+    """
+    NOTHING = 0  # None, the scraper makes all its own requests
+    RESPONSE = 1  # the requests.Response of the landing page
+    TREE = 2  # the landing page parsed as an lxml HTML tree
+
+
+def requires(scraper_input: ScraperInput):
+    """
+    Decorator declaring what a scraper function needs passed as the landing page.
+    """
+    def decorator(scrape):
+        scrape.scraper_input = scraper_input
+        return scrape
+    return decorator
+
+
+def required_input(scrape: Callable) -> ScraperInput:
+    return getattr(scrape, "scraper_input", ScraperInput.TREE)
+
+
+class LazyScraper:
+    """
+    A reference to a scraper function by module and function name, only imported when it is needed.
+    """
+
+    def __init__(self, reference: str):
+        self.module_name, self.function_name = reference.split(":")
+        self._function: Optional[Callable] = None
+
+    def resolve(self) -> Callable:
+        if self._function is None:
+            module = importlib.import_module(self.module_name)
+            self._function = getattr(module, self.function_name)
+        return self._function
+
+    def __call__(self, scraper, tree):
+        return self.resolve()(scraper, tree)
+
+    def __repr__(self):
+        return f"LazyScraper('{self.module_name}:{self.function_name}')"
+
+
+class PrefixTrie:
+    """
+    A character trie of URI prefixes, for finding the longest registered prefix of a URI.
+    """
+
+    _END = None  # key of the value stored at the node where a prefix ends
+
+    def __init__(self):
+        self._root = {}
+
+    def insert(self, prefix: str, value):
+        node = self._root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[self._END] = value
+
+    def longest_match(self, uri: str):
+        node = self._root
+        found = node.get(self._END)
+        for char in uri:
+            node = node.get(char)
+            if node is None:
+                break
+            if self._END in node:
+                found = node[self._END]
+        return found
+
+
+class _ScraperList(list):
+    """
+    The list of (start_uri, scraper) pairs, registering any added to it, as transforms have long
+    appended their own to scraper_list.
+    """
+
+    def append(self, item):
+        super().append(item)
+        register(*item)
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        register(*item)
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        for item in items:
+            register(*item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+
+scraper_list = _ScraperList([
+    ('https://api.beta.ons.gov.uk', LazyScraper('gssutils.scrapers.onscmd:scrape')),
+    ('https://www.ons.gov.uk/', LazyScraper('gssutils.scrapers.ons:scrape')),
+    ('https://www.gov.uk/government/', LazyScraper('gssutils.scrapers.govuk:content_api')),
+    ('https://www.ethnicity-facts-figures.service.gov.uk/', LazyScraper('gssutils.scrapers.govuk:eth_facts_service')),
+    ('https://www.nrscotland.gov.uk/statistics-and-data/statistics/',
+     LazyScraper('gssutils.scrapers.nrscotland:statistics_handler')),
+    ('https://www.nrscotland.gov.uk/covid19stats', LazyScraper('gssutils.scrapers.nrscotland:covid_handler')),
+    ('https://www.nisra.gov.uk/publications/', LazyScraper('gssutils.scrapers.nisra:scrape')),
+    ('https://www.uktradeinfo.com/Statistics/Pages/', LazyScraper('gssutils.scrapers.hmrc:scrape_pages')),
     ('https://www.uktradeinfo.com/Statistics/OverseasTradeStatistics/AboutOverseastradeStatistics/Pages/OTSReports.aspx',
-     hmrc.scrape_ots_reports),
-    ('https://www.uktradeinfo.com/Statistics/RTS/Pages/default.aspx', hmrc.scrape_rts),
-    ('https://www.justice-ni.gov.uk/publications/', ni_govuk.scrape),
-    ('https://www.health-ni.gov.uk/publications/', ni_govuk.scrape),
-    ('http://www.isdscotland.org/Health-Topics/', isd_scotland.scrape),
-    ('https://digital.nhs.uk/data-and-information/publications/statistical/', nhs_digital.scrape),
-    ('https://statswales.gov.wales/Catalogue', statswales.scrape),
-    ('https://www.gov.scot', govscot.scrape),
-    ('https://www2.gov.scot/Topics/Statistics/Browse/', govscot.scrape),
-    ('https://www.communities-ni.gov.uk/publications/topic', dcni.scrape),
-    ('https://gov.wales/', govwales.scrape),
-    ('https://www.lowcarboncontracts.uk/data-portal/dataset', lcc.scrape),
-    ('https://www.gov.uk/guidance', govuk.content_api),
-    ('https://oifdata.defra.gov.uk', defra.scrape)
-]
+     LazyScraper('gssutils.scrapers.hmrc:scrape_ots_reports')),
+    ('https://www.uktradeinfo.com/Statistics/RTS/Pages/default.aspx', LazyScraper('gssutils.scrapers.hmrc:scrape_rts')),
+    ('https://www.justice-ni.gov.uk/publications/', LazyScraper('gssutils.scrapers.ni_govuk:scrape')),
+    ('https://www.health-ni.gov.uk/publications/', LazyScraper('gssutils.scrapers.ni_govuk:scrape')),
+    ('http://www.isdscotland.org/Health-Topics/', LazyScraper('gssutils.scrapers.isd_scotland:scrape')),
+    ('https://digital.nhs.uk/data-and-information/publications/statistical/',
+     LazyScraper('gssutils.scrapers.nhs_digital:scrape')),
+    ('https://statswales.gov.wales/Catalogue', LazyScraper('gssutils.scrapers.statswales:scrape')),
+    ('https://www.gov.scot', LazyScraper('gssutils.scrapers.govscot:scrape')),
+    ('https://www2.gov.scot/Topics/Statistics/Browse/', LazyScraper('gssutils.scrapers.govscot:scrape')),
+    ('https://www.communities-ni.gov.uk/publications/topic', LazyScraper('gssutils.scrapers.dcni:scrape')),
+    ('https://gov.wales/', LazyScraper('gssutils.scrapers.govwales:scrape')),
+    ('https://www.lowcarboncontracts.uk/data-portal/dataset', LazyScraper('gssutils.scrapers.lcc:scrape')),
+    ('https://www.gov.uk/guidance', LazyScraper('gssutils.scrapers.govuk:content_api')),
+    ('https://oifdata.defra.gov.uk', LazyScraper('gssutils.scrapers.defra:scrape'))
+])
+
+_registry = PrefixTrie()
+_plugins_loaded = False
+_plugins_lock = threading.Lock()
+
+
+def register(start_uri: str, scraper: Union[str, Callable]):
+    """
+    Register a scraper for landing pages starting with start_uri, either as the scraper function
+    itself or as a "module:function" reference to be imported when first used.
+    """
+    if isinstance(scraper, str):
+        scraper = LazyScraper(scraper)
+    _registry.insert(start_uri, scraper)
+
+
+def _load_plugins():
+    global _plugins_loaded
+    with _plugins_lock:
+        if _plugins_loaded:
+            return
+        eps = entry_points()
+        eps = eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, "select") else eps.get(ENTRY_POINT_GROUP, [])
+        for ep in eps:
+            try:
+                for start_uri, scraper in ep.load():
+                    register(start_uri, scraper)
+            except Exception:
+                logging.exception(f"Unable to load scrapers from entry point {ep.name}")
+        _plugins_loaded = True
+
+
+def lookup(uri: str) -> Optional[Callable]:
+    """
+    Return the scraper function for the given landing page URI, or None if nothing handles it.
+    """
+    _load_plugins()
+    scraper = _registry.longest_match(uri)
+    if isinstance(scraper, LazyScraper):
+        return scraper.resolve()
+    return scraper
+
+
+for _start_uri, _scraper in scraper_list:
+    register(_start_uri, _scraper)
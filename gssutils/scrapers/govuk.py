@@ -11,12 +11,14 @@ from gssutils.metadata import GOV
 from gssutils.metadata.dcat import Distribution
 from gssutils.metadata.mimetype import ODS, PDF
 from gssutils.metadata.pmdcat import Dataset
+from gssutils.scrapers import requires, ScraperInput
 from dateutil.parser import parse
 from gssutils.metadata.mimetype import *
 import re
 
 ACCEPTED_MIMETYPES = [ODS, Excel, ExcelOpenXML, ExcelTypes, ZIP, CSV, CSDB]
 
+@requires(ScraperInput.NOTHING)
 def content_api(scraper, tree):
     final_url = False
     uri_components = urlparse(scraper.uri)
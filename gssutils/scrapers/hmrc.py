@@ -6,7 +6,7 @@ from dateutil.parser import parse
 from lxml import html
 
 from gssutils.metadata import GOV, THEME
-from gssutils.metadata.dcat import Distribution
+from gssutils.metadata.dcat import Distribution, DistributionTable
 from gssutils.metadata.mimetype import Excel
 from gssutils.metadata.pmdcat import Dataset
 
@@ -32,7 +32,8 @@ def scrape_pages(scraper, tree):
                 dataset = Dataset(scraper.uri)
                 dataset.publisher = scraper.catalog.publisher
                 dataset.license = scraper.catalog.license
-                dataset.distribution = []
+                # archive pages list every past release, so keep them in a compact table
+                dataset.distribution = DistributionTable(scraper)
                 bulletin_date = None
                 for k, v in zip(columns, row.xpath("td")):
                     if k == 'Bulletin Title' or k == 'Title' or k == 'Factsheet Title':
@@ -52,14 +53,15 @@ def scrape_pages(scraper, tree):
                             archive_page = scraper.session.get(view_url)
                             archive_tree = html.fromstring(archive_page.text)
                             for release_row in archive_tree.xpath("//table[@class='hmrc']//tr")[1:]:
-                                dist = Distribution(scraper)
                                 cols = release_row.xpath("td")
-                                dist.downloadURL = urljoin(view_url, cols[1].xpath("a/@href")[0].replace(' ', '%20'))
+                                download_url = urljoin(view_url, cols[1].xpath("a/@href")[0].replace(' ', '%20'))
                                 archive_date = cols[0].text
-                                dist.issued = parse(archive_date.strip(), dayfirst=True)
-                                dist.mediaType, _ = mimetypes.guess_type(dist.downloadURL)
-                                dist.title = dataset.title + ' ' + archive_date
-                                dataset.distribution.append(dist)
+                                dataset.distribution.add(
+                                    downloadURL=download_url,
+                                    issued=parse(archive_date.strip(), dayfirst=True),
+                                    mediaType=mimetypes.guess_type(download_url)[0],
+                                    title=dataset.title + ' ' + archive_date
+                                )
                         else:
                             dist = Distribution(scraper)
                             dist.downloadURL = urljoin(scraper.uri, href)
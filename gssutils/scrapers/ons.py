@@ -3,6 +3,7 @@ from io import StringIO
 import logging
 import mimetypes
 import os
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, urlunparse
 
 import backoff
@@ -12,6 +13,7 @@ from distutils.util import strtobool
 
 from gssutils.metadata.dcat import Distribution
 from gssutils.metadata.mimetype import Excel, ODS, CSV, ExcelOpenXML, CSDB
+from gssutils.scrapers import requires, ScraperInput
 
 
 # save ourselves some typing later
@@ -27,6 +29,22 @@ def get_dict_from_json_url(url, scraper):
     return get(url, scraper)
 
 
+def get_dicts_from_json_urls(urls, scraper):
+    """
+    Given a list of urls, return a list of dicts in the same order.
+
+    The documents are fetched concurrently when the DE sets the ONS_SCRAPER_MAX_WORKERS env var
+    above 1, otherwise one after another. Every url we fetch here is on the ONS host, so the
+    number of workers is also the maximum number of requests in flight against it.
+    """
+    max_workers = int(os.getenv("ONS_SCRAPER_MAX_WORKERS", "1"))
+    if max_workers <= 1 or len(urls) <= 1:
+        return [get_dict_from_json_url(url, scraper) for url in urls]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        # map() yields results in the order of the inputs, not the order they complete in
+        return list(executor.map(lambda url: get_dict_from_json_url(url, scraper), urls))
+
+
 def get(url, scraper):
     """ Given a url, return a dict"""
     r = scraper.session.get(url)
@@ -45,14 +63,15 @@ def retry_get(url, scraper):
         print(f'Retrying failed attempt to get dict from json. Error was: {err}')
         raise err
 
-    
+
+@requires(ScraperInput.NOTHING)
 def scrape(scraper, tree):
     """
     This is json scraper for ons.gov.uk pages
     This scraper will attempt to gather metadata from "standard" fields shared across page types
     then drop into page-type specific handlers.
     :param scraper:         the Scraper object
-    :param landing_page:    the provided url
+    :param tree:            None, this scraper only uses the /data json
     :return:
     """
 
@@ -177,9 +196,14 @@ def handler_dataset_landing_page(scraper, landing_page, tree):
     # A dataset landing page has uri's to one or more datasets via it's "datasets" field.
     # We need to look at each in turn, this is an example one as json:
     # https://www.ons.gov.uk//businessindustryandtrade/internationaltrade/datasets/uktradeingoodsbyclassificationofproductbyactivity/current/data
-    for dataset_page_url in landing_page["datasets"]:
+    dataset_pages = get_dicts_from_json_urls(
+        [ONS_PREFIX + dataset_page_url["uri"] + "/data" for dataset_page_url in landing_page["datasets"]],
+        scraper
+    )
 
-        this_dataset_page = get_dict_from_json_url(ONS_PREFIX + dataset_page_url["uri"] + "/data", scraper)
+    # Work out the version urls of every dataset up front, so they can all be fetched in one go
+    versions_per_dataset = []
+    for dataset_page_url, this_dataset_page in zip(landing_page["datasets"], dataset_pages):
 
         # create a list, with each entry a dict of a versions url and update date
         versions_dict_list = []
@@ -227,56 +251,61 @@ def handler_dataset_landing_page(scraper, landing_page, tree):
             "issued": initial_release if next_release is None else next_release
         })
 
-        # NOTE - we've had an issue with the very latest dataset not being updated on the previous versions
-        # page (the page we're getting the distributions from) so we're taking the details for it from
-        # the landing page to use as a fallback in that scenario.
-
-        # iterate through the lot, we're aiming to create at least one distribution object for each
-        for i, version_dict in enumerate(versions_dict_list):
-
-            version_url = version_dict["url"]
-            issued = version_dict["issued"]
-
-            logging.debug("Identified distribution url, building distribution object for: " + version_url)
-
-            # get the response json into a python dict
-            this_page = get_dict_from_json_url(version_url, scraper)
-
-            # Get the download urls, if there's more than 1 format of this version of the dataset
-            # each forms a separate distribution
-            distribution_formats = this_page["downloads"]
-            for dl in distribution_formats:
-
-                # Create an empty Distribution object to represent this distribution
-                # from here we're just looking to fill in it's fields
-                this_distribution = Distribution(scraper)
-                this_distribution.issued = parse_as_local_date(issued)
-
-                # I don't trust dicts with one constant field (they don't make sense), so just in case...
-                try:
-                    download_url = ONS_DOWNLOAD_PREFIX + this_page["uri"] + "/" + dl["file"].strip()
-                    this_distribution.downloadURL = download_url
-                except:
-                    # Throw a warning and abandon this distribution, ff we don't have a downloadURL it's not much use
-                    logging.warning("Unable to create complete download url for {} on page {}"
-                                    .format(dl, version_url))
-                    continue
-
-                # we've had some issues with type-guessing so we're getting the media type
-                # by checking the download url ending
-                if download_url.endswith(".csdb"):
-                    media_type = CSDB
-                else:
-                    media_type, _ = mimetypes.guess_type(download_url)
-
-                this_distribution.mediaType = media_type
-                
-                # inherit metadata from the dataset where it hasn't explicitly been changed
-                this_distribution.title = scraper.dataset.title
-                this_distribution.description = scraper.dataset.description
-
-                logging.debug("Created distribution for download '{}'.".format(download_url))
-                scraper.distributions.append(this_distribution)
+        versions_per_dataset.append(versions_dict_list)
+
+    # NOTE - we've had an issue with the very latest dataset not being updated on the previous versions
+    # page (the page we're getting the distributions from) so we're taking the details for it from
+    # the landing page to use as a fallback in that scenario.
+
+    all_versions_dict_list = [version_dict for versions_dict_list in versions_per_dataset
+                              for version_dict in versions_dict_list]
+    # get the response json of every version into a python dict, keeping the order of the versions
+    version_pages = get_dicts_from_json_urls([version_dict["url"] for version_dict in all_versions_dict_list],
+                                             scraper)
+
+    # iterate through the lot, we're aiming to create at least one distribution object for each
+    for version_dict, this_page in zip(all_versions_dict_list, version_pages):
+
+        version_url = version_dict["url"]
+        issued = version_dict["issued"]
+
+        logging.debug("Identified distribution url, building distribution object for: " + version_url)
+
+        # Get the download urls, if there's more than 1 format of this version of the dataset
+        # each forms a separate distribution
+        distribution_formats = this_page["downloads"]
+        for dl in distribution_formats:
+
+            # Create an empty Distribution object to represent this distribution
+            # from here we're just looking to fill in it's fields
+            this_distribution = Distribution(scraper)
+            this_distribution.issued = parse_as_local_date(issued)
+
+            # I don't trust dicts with one constant field (they don't make sense), so just in case...
+            try:
+                download_url = ONS_DOWNLOAD_PREFIX + this_page["uri"] + "/" + dl["file"].strip()
+                this_distribution.downloadURL = download_url
+            except:
+                # Throw a warning and abandon this distribution, ff we don't have a downloadURL it's not much use
+                logging.warning("Unable to create complete download url for {} on page {}"
+                                .format(dl, version_url))
+                continue
+
+            # we've had some issues with type-guessing so we're getting the media type
+            # by checking the download url ending
+            if download_url.endswith(".csdb"):
+                media_type = CSDB
+            else:
+                media_type, _ = mimetypes.guess_type(download_url)
+
+            this_distribution.mediaType = media_type
+            
+            # inherit metadata from the dataset where it hasn't explicitly been changed
+            this_distribution.title = scraper.dataset.title
+            this_distribution.description = scraper.dataset.description
+
+            logging.debug("Created distribution for download '{}'.".format(download_url))
+            scraper.distributions.append(this_distribution)
 
 
 def handler_static_adhoc(scraper, landing_page, tree):
@@ -4,6 +4,7 @@ from dateutil.parser import parse
 
 from gssutils.metadata.dcat import Distribution
 from gssutils.metadata.mimetype import CSV
+from gssutils.scrapers import requires, ScraperInput
 
 
 def request_json_data(scraper, uri):
@@ -17,12 +18,13 @@ def request_json_data(scraper, uri):
     return r.json()
 
 
+@requires(ScraperInput.NOTHING)
 def scrape(scraper, tree):
     """
     This is a scraper intended to use the ONS cmd (customise my data) functionality.
 
     :param scraper:         the Scraper object
-    :param landing_page:    lxml tree
+    :param tree:            None, this scraper only uses the json API
     :return:
     """
 
@@ -9,10 +9,12 @@ from pyRdfa import pyRdfa as rdfa_processor, Options, HostLanguage
 
 from gssutils.metadata import DCAT, GOV
 from gssutils.metadata.dcat import Distribution
+from gssutils.scrapers import requires, ScraperInput
 
 
-def scrape(scraper, tree):
-    page = StringIO(scraper.session.get(scraper.uri).text)
+@requires(ScraperInput.RESPONSE)
+def scrape(scraper, landing_page):
+    page = StringIO(landing_page.text)
     pageGraph = _parse_rdfa_to_graph(page)
     # pageGraph.parse(page, format="html")
     dataset = pageGraph.value(predicate=RDF.type, object=DCAT.Dataset, any=False)
@@ -0,0 +1,323 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import msgpack
+import requests
+from cachecontrol import serialize
+from cachecontrol.adapter import CacheControlAdapter
+from cachecontrol.cache import BaseCache
+from cachecontrol.heuristics import LastModified
+
+from gssutils.cache import BLOB_DIR, BLOB_RECORD_PREFIX, DEFAULT_CACHE_DIR, create_cache
+
+# Bodies larger than this are kept out of the msgpack record, in a file of their own.
+BLOB_THRESHOLD = 1000 * 1000  # 1MB
+# Enough to keep a pool open to every publisher host a pipeline is likely to touch.
+DEFAULT_POOL_CONNECTIONS = 32
+# Connections kept alive per host, enough for the concurrent scrapers to not block on each other.
+DEFAULT_POOL_MAXSIZE = 16
+
+
+class BiggerSerializer(serialize.Serializer):
+    def _loads_v4(self, request, data):
+        try:
+            cached = msgpack.loads(
+                data, raw=False, max_bin_len=100 * 1000 * 1000
+            )  # 100MB
+        except ValueError:
+            return
+
+        return self.prepare_response(request, cached)
+
+
+class BlobSerializer(BiggerSerializer):
+    """
+    Serializes large response bodies to a content addressed file under blob_dir, keeping only the
+    headers in the msgpack record, so that a cache hit for a big download is streamed from disk
+    rather than loaded into memory. Small bodies are serialized inline as before.
+
+    The SQLite cache deletes a blob along with the last entry referring to it. The file cache
+    never evicts anything, so with it delete blob_dir to reclaim the space.
+    """
+
+    def __init__(self, blob_dir: Union[str, Path]):
+        self.blob_dir = Path(blob_dir)
+
+    def dumps(self, request, response, body=None):
+        if body is None or len(body) <= BLOB_THRESHOLD:
+            return super().dumps(request, response, body)
+
+        blob = hashlib.sha256(body).hexdigest()
+        blob_path = self.blob_dir / blob
+        if not blob_path.exists():
+            self.blob_dir.mkdir(parents=True, exist_ok=True)
+            # write then rename, so other processes never see a partial blob
+            fd, tmp_path = tempfile.mkstemp(dir=self.blob_dir)
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(body)
+            os.replace(tmp_path, blob_path)
+
+        record = msgpack.loads(
+            super().dumps(request, response, b"").split(b",", 1)[1], raw=False
+        )
+        record["blob"] = blob
+        return BLOB_RECORD_PREFIX + msgpack.dumps(record, use_bin_type=True)
+
+    def _loads_vblob(self, request, data):
+        try:
+            cached = msgpack.loads(data, raw=False)
+        except ValueError:
+            return
+
+        try:
+            body = open(self.blob_dir / cached.pop("blob"), "rb")
+        except FileNotFoundError:
+            return  # treat as a cache miss
+
+        response = self.prepare_response(request, cached)
+        if response is None:
+            body.close()
+            return
+        response._fp = body
+        return response
+
+
+def cached_blob_path(raw) -> Optional[Path]:
+    """
+    The path of the blob a BlobSerializer is serving the given urllib3 response body from, if it is
+    one and nothing has been read from it yet, so that loaders can open the file directly instead of
+    copying it. Bodies with a Content-Encoding are stored encoded, so aren't usable as they are.
+    """
+    fp = getattr(raw, "_fp", None)
+    if (
+        isinstance(fp, io.BufferedReader)
+        and not getattr(raw, "headers", {}).get("Content-Encoding")
+        and fp.tell() == 0
+    ):
+        return Path(fp.name)
+    return None
+
+
+@dataclass
+class DownloadRecord:
+    """
+    What was transferred for a single request: how many (decoded) bytes of the body, in how long
+    from sending the request to the last read, and whether it came from the HTTP cache. For a
+    streamed response these are updated as the body is read, and final once `complete`.
+    """
+
+    url: str
+    method: str
+    status: int
+    from_cache: bool
+    bytes: int = 0
+    seconds: float = 0.0
+    complete: bool = False
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Bytes per second, if the transfer took any measurable time."""
+        return self.bytes / self.seconds if self.seconds > 0 else None
+
+    def as_dict(self) -> dict:
+        return dict(asdict(self), throughput=self.throughput)
+
+
+class ScraperSession(requests.Session):
+    """
+    The session a Scraper, and the distributions it finds, make their requests through.
+
+    A requests session sharing the adapters (so the connection pools and HTTP cache), headers,
+    cookies and hooks of a (usually shared) session, that while `recording` keeps the validators
+    (ETag and Last-Modified) of every document fetched, so that a later run can ask the publisher
+    whether any of them have changed. Every request is also kept as a DownloadRecord in
+    `downloads`, and passed to metrics_callback once its body has been read.
+
+    The adapters belong to the shared session, so closing this one leaves them open.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        metrics_callback: Optional[Callable[[DownloadRecord], None]] = None,
+    ):
+        # not requests.Session.__init__(), which would mount adapters only to be replaced
+        for attr in self.__attrs__:
+            setattr(self, attr, getattr(session, attr))
+        self.recording = True
+        self.documents: Dict[str, Dict[str, str]] = {}
+        self.downloads: List[DownloadRecord] = []
+        self.metrics_callback = metrics_callback
+        self._downloads_lock = threading.Lock()
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        response = super().request(method, url, *args, **kwargs)
+        if self.recording and method.upper() == "GET":
+            self.documents[response.url] = {
+                validator: response.headers[header]
+                for validator, header in [("etag", "ETag"), ("last_modified", "Last-Modified")]
+                if header in response.headers
+            }
+        record = DownloadRecord(
+            url=response.url,
+            method=method.upper(),
+            status=response.status_code,
+            from_cache=getattr(response, "from_cache", False),
+        )
+        with self._downloads_lock:
+            self.downloads.append(record)
+        if kwargs.get("stream", False) and hasattr(response.raw, "read"):
+            self._instrument_stream(response.raw, record, start)
+        else:
+            record.bytes = len(response.content)
+            self._complete(record, start)
+        return response
+
+    def close(self):
+        pass
+
+    def _complete(self, record: DownloadRecord, start: float):
+        if not record.complete:
+            record.seconds = time.perf_counter() - start
+            record.complete = True
+            if self.metrics_callback is not None:
+                self.metrics_callback(record)
+
+    def _instrument_stream(self, raw, record: DownloadRecord, start: float):
+        """
+        Count what's read from a streamed body, as Distribution.open() hands out the raw stream
+        rather than the response. A body closed unread while it can be opened straight from its
+        cached blob (see cached_blob_path) counts as the size of the blob, as that's what the
+        loader reads instead.
+        """
+        read, close = raw.read, raw.close
+
+        def counting_read(*args, **kwargs):
+            data = read(*args, **kwargs)
+            record.bytes += len(data)
+            record.seconds = time.perf_counter() - start
+            if len(data) == 0:
+                self._complete(record, start)
+            return data
+
+        def completing_close():
+            if record.bytes == 0:
+                blob_path = cached_blob_path(raw)
+                if blob_path is not None:
+                    record.bytes = blob_path.stat().st_size
+            self._complete(record, start)
+            return close()
+
+        raw.read = counting_read
+        raw.close = completing_close
+
+    def download_report(self) -> dict:
+        """
+        The downloads made through this session so far, with totals.
+        """
+        with self._downloads_lock:
+            downloads = [record.as_dict() for record in self.downloads]
+        total_bytes = sum(d["bytes"] for d in downloads)
+        total_seconds = sum(d["seconds"] for d in downloads)
+        cache_hits = sum(1 for d in downloads if d["from_cache"])
+        return {
+            "requests": len(downloads),
+            "bytes": total_bytes,
+            "seconds": total_seconds,
+            "cache_hits": cache_hits,
+            "cache_hit_ratio": cache_hits / len(downloads) if downloads else None,
+            "network_bytes": sum(d["bytes"] for d in downloads if not d["from_cache"]),
+            "throughput": total_bytes / total_seconds if total_seconds > 0 else None,
+            "downloads": downloads,
+        }
+
+
+class SessionPool:
+    """
+    A registry of cached requests sessions, keyed by cache backend, cache directory and connection
+    pool options.
+
+    Scrapers (and the distributions they create) share a session from here rather than each
+    building their own, so connections and TLS handshakes to the same hosts are re-used across
+    every scrape in the process. Use as a context manager, or call close_all(), to release the
+    pooled connections.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[Tuple, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        cache: Optional[Union[str, BaseCache]] = None,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    ) -> requests.Session:
+        """
+        Get the session for the given cache, which is either a cache instance or the name of a
+        backend understood by gssutils.cache.create_cache.
+        """
+        if not isinstance(cache, BaseCache):
+            cache = cache or os.getenv("SCRAPER_CACHE", "file")
+        key = (cache, cache_dir, pool_connections, pool_maxsize)
+        with self._lock:
+            if key not in self._sessions:
+                self._sessions[key] = self._create_session(*key)
+            return self._sessions[key]
+
+    @staticmethod
+    def _create_session(cache, cache_dir, pool_connections, pool_maxsize) -> requests.Session:
+        if not isinstance(cache, BaseCache):
+            cache = create_cache(cache, cache_dir)
+        session = requests.Session()
+        adapter = CacheControlAdapter(
+            cache=cache,
+            serializer=BlobSerializer(Path(cache_dir) / BLOB_DIR),
+            heuristic=LastModified(),
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close_all(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_all()
+
+
+default_pool = SessionPool()
+
+
+def get_session(**kwargs) -> requests.Session:
+    """
+    Get the shared, cached session from the process wide pool.
+    """
+    return default_pool.get(**kwargs)
+
+
+def close_sessions():
+    """
+    Close every session in the process wide pool, the next get_session() will create a new one.
+    """
+    default_pool.close_all()
@@ -77,9 +77,12 @@ class Cubes:
             )
         )
 
-    def output_all(self):
+    def output_all(self, catalog_writer=None):
         """
         Output every cube object we've added to the cubes() class.
+
+        Given a gssutils.metadata.quads.CatalogWriter, the catalog metadata of every cube is written
+        to it, rather than to a .csv-metadata.trig file per cube.
         """
 
         logging.warning("Using Cubes.output_all() as the method of serialising to CSV-W is depreciated, see the documentation on how to migrate to info.json v1.1 and csvcubed at gssutils/csvcubedintegration/configloaders/README.md")
@@ -115,7 +118,11 @@ class Cubes:
         for cube in self.cubes:
             try:
                 cube.output(
-                    self.destination_folder, is_multi_cube, is_many_to_one, self.info
+                    self.destination_folder,
+                    is_multi_cube,
+                    is_many_to_one,
+                    self.info,
+                    catalog_writer,
                 )
             except Exception as err:
                 raise Exception(
@@ -205,7 +212,14 @@ class Cube:
 
         return map_obj
 
-    def output(self, destination_folder, is_multi_cube, is_many_to_one, info_json):
+    def output(
+        self,
+        destination_folder,
+        is_multi_cube,
+        is_many_to_one,
+        info_json,
+        catalog_writer=None,
+    ):
         """
         Outputs the csv and csv-w schema for a single 'Cube' held in the 'Cubes' object
         """
@@ -258,12 +272,16 @@ class Cube:
         # Don't output trig file if we're performing an accretive upload (or we have been asked to suppress it).
         # We don't want to duplicate information we already have.
         if not is_accretive_upload and not self.suppress_catalog_and_dsd_output:
-            # Output the trig
-            trig_to_use = self.scraper.generate_trig()
-            with open(
-                destination_folder / f"{pathify(self.title)}.csv-metadata.trig", "wb"
-            ) as metadata:
-                metadata.write(trig_to_use)
+            if catalog_writer is not None:
+                # written now, as the scraper may be shared with the next cube and given another ID
+                catalog_writer.add(self.scraper)
+            else:
+                # Output the trig
+                trig_to_use = self.scraper.generate_trig()
+                with open(
+                    destination_folder / f"{pathify(self.title)}.csv-metadata.trig", "wb"
+                ) as metadata:
+                    metadata.write(trig_to_use)
 
         # Output csv and csvw
         populated_map_obj = self._populate_csvw_mapping(
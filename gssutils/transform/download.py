@@ -1,4 +1,14 @@
+import hashlib
 import logging
+import mimetypes
+import re
+import shutil
+import tempfile
+import weakref
+import zipfile
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from io import BytesIO
 
 import backoff
@@ -8,12 +18,22 @@ import pandas as pd
 import requests
 import xypath
 from os import environ
-from typing import List, Union, Dict, Optional
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple, Union
+from urllib.parse import quote
 
+from gssutils.cache import ParsedCache, create_odata_progress, create_parsed_cache
 from gssutils.metadata.base import Resource
-from gssutils.metadata.mimetype import ExcelTypes, Excel, ExcelOpenXML, ODS
+from gssutils.metadata.mimetype import ExcelTypes, Excel, ExcelOpenXML, ODS, CSV, ZIP
+from gssutils.transform.dtypes import compact_dtypes
+from gssutils.session import cached_blob_path
 from gssutils.utils import recordable
 
+# Rows per DataFrame yielded by Downloadable.iter_pandas(), unless asked otherwise.
+DEFAULT_CHUNKSIZE = 100000
+# Spreadsheets larger than this are spooled to a temporary file rather than held in memory.
+SPOOL_MAX_SIZE = 10 * 1000 * 1000  # 10MB
+
 
 class FormatError(Exception):
     """Raised when the available file format can't be used"""
@@ -22,9 +42,151 @@ class FormatError(Exception):
         self.message = message
 
 
+class ODataError(Exception):
+    """Raised when an OData API doesn't return a page of data"""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+def _content_hash(fobj) -> str:
+    """
+    The sha256 of the rest of a seekable file, which is left where it was.
+    """
+    start = fobj.tell()
+    digest = hashlib.sha256()
+    for block in iter(lambda: fobj.read(1024 * 1024), b""):
+        digest.update(block)
+    fobj.seek(start)
+    return digest.hexdigest()
+
+
+# Keys of the link to the next page of an OData response, as used by StatsWales and the HMRC Trade UK API
+ODATA_NEXT_LINKS = ["odata.nextLink", "@odata.nextLink"]
+_ODATA_SKIP = re.compile(r"([?&]\$skip=)(\d+)")
+
+
+def _odata_next_link(contents: dict) -> Optional[str]:
+    for key in ODATA_NEXT_LINKS:
+        if key in contents:
+            return contents[key]
+    return None
+
+
+def _odata_skip(link: str) -> Optional[int]:
+    match = _ODATA_SKIP.search(link)
+    return int(match.group(2)) if match is not None else None
+
+
+def _odata_with_skip(link: str, skip: int) -> str:
+    return _ODATA_SKIP.sub(lambda m: f"{m.group(1)}{skip}", link, count=1)
+
+
+# The reference period of a YYYYMM chunk (e.g. the HMRC MonthId) as PMD has it, by default
+DEFAULT_CHUNK_URI_TEMPLATE = "http://reference.data.gov.uk/id/month/{year}-{month}"
+
+
+def _odata_max_workers() -> int:
+    return int(environ.get("ODATA_MAX_WORKERS", "1"))
+
+
+def _odata_worker_split(tasks: int) -> Tuple[int, int]:
+    """
+    Splits the ODATA_MAX_WORKERS requests allowed at once between running the given number of
+    queries at a time and the pages of each query, so that between them they stay within it.
+    """
+    max_workers = _odata_max_workers()
+    query_workers = max(1, min(tasks, max_workers))
+    return query_workers, max(1, max_workers // query_workers)
+
+
+def _odata_chunk_tries() -> int:
+    return int(environ.get("ODATA_CHUNK_TRIES", "5"))
+
+
+# A sheet is selected by its name, a regular expression matching the whole name, or its index.
+SheetSelector = Union[str, Pattern, int]
+
+
+def _sheet_selected(selectors: List[SheetSelector], index: int, name: str) -> bool:
+    for selector in selectors:
+        if isinstance(selector, int):
+            if selector == index:
+                return True
+        elif isinstance(selector, str):
+            if selector == "*" or selector.strip() == name.strip():
+                return True
+        elif isinstance(selector, re.Pattern):
+            if selector.fullmatch(name) is not None:
+                return True
+        else:
+            raise TypeError(f"Don't know how to select a sheet with a {type(selector)}")
+    return False
+
+
+class TabCollection(Sequence):
+    """
+    The tabs of a spreadsheet as databaker (xypath) tables, each one only parsed from the underlying
+    messytables table when it is first accessed. The tab names are available from `names` without
+    parsing anything.
+
+    Holds on to the spreadsheet file until the collection is closed, or garbage collected.
+    """
+
+    def __init__(self, mt_tables: list, resources: Optional[ExitStack] = None):
+        # (index in the workbook, messytables table)
+        self._mt_tables = list(mt_tables)
+        self._tabs: Dict[int, xypath.Table] = {}
+        self._finalizer = weakref.finalize(
+            self, resources.close if resources is not None else lambda: None
+        )
+
+    @property
+    def names(self) -> List[str]:
+        return [mt_table.name for _, mt_table in self._mt_tables]
+
+    def _tab(self, position: int) -> xypath.Table:
+        if position not in self._tabs:
+            index, mt_table = self._mt_tables[position]
+            tab = xypath.Table.from_messy(mt_table)
+            tab.index = index
+            self._tabs[position] = tab
+        return self._tabs[position]
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._tab(position) for position in range(len(self))[item]]
+        return self._tab(range(len(self))[item])
+
+    def __len__(self):
+        return len(self._mt_tables)
+
+    def __repr__(self):
+        return f"TabCollection({self.names})"
+
+    def close(self):
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _compacted(data):
+    if isinstance(data, pd.DataFrame):
+        return compact_dtypes(data)
+    elif isinstance(data, dict):
+        return {name: compact_dtypes(df) for name, df in data.items()}
+    return (compact_dtypes(df) for df in data)
+
+
 class Downloadable(Resource):
     """
-    Mixin for downloadable resources, adding as_pandas() and as_databaker() methods.
+    Mixin for downloadable resources, adding as_pandas(), iter_pandas(), as_databaker() and
+    databaker_tabs() methods.
     Expects self.uri to be a web resource.
     Expects self._mediaType to be set to determine the file type of the downloadable resource.
     Expects self._session to be a re-usable requests session object.
@@ -43,60 +205,214 @@ class Downloadable(Resource):
         stream.decode_content = True
         return stream
 
-    def as_databaker(self, **kwargs) -> List[xypath.Table]:
-        return self._get_simple_databaker_tabs(**kwargs)
+    @contextmanager
+    def _open_seekable(self):
+        """
+        Opens the resource as a seekable binary file, as spreadsheet loaders need. A body the HTTP
+        cache holds as a blob is opened in place, otherwise the response is buffered in memory, or
+        spooled to a temporary file once it is larger than SPOOL_MAX_SIZE.
+        """
+        with ExitStack() as stack:
+            # the response is released before the file is handed over
+            with self.open() as stream:
+                blob_path = cached_blob_path(stream)
+                if blob_path is not None:
+                    fobj = stack.enter_context(open(blob_path, "rb"))
+                else:
+                    # not a SpooledTemporaryFile, which isn't seekable() before Python 3.11
+                    fobj = stack.enter_context(BytesIO())
+                    for block in iter(lambda: stream.read(1024 * 1024), b""):
+                        fobj.write(block)
+                        if fobj.tell() > SPOOL_MAX_SIZE:
+                            spooled = stack.enter_context(tempfile.TemporaryFile())
+                            spooled.write(fobj.getbuffer())
+                            fobj.close()
+                            fobj = spooled
+                            shutil.copyfileobj(stream, fobj)
+                            break
+                    fobj.seek(0)
+            yield fobj
+
+    def members(self) -> List["ZipMember"]:
+        """
+        Lists the files in a ZIP distribution, each of which can be loaded with as_pandas() or
+        as_databaker() without extracting the rest of the archive. The archive is read from the
+        HTTP cache's copy of the body where there is one, and stays open while any member is used.
+        """
+        if self._mediaType != ZIP:
+            raise FormatError(f"Unable to list the members of {self._mediaType}, only {ZIP}.")
+        resources = ExitStack()
+        try:
+            archive = _ZipArchive(resources, resources.enter_context(self._open_seekable()))
+        except BaseException:
+            resources.close()
+            raise
+        return [
+            ZipMember(archive, info, self.uri)
+            for info in archive.zipfile.infolist()
+            if not info.is_dir()
+        ]
+
+    def as_databaker(
+        self, sheets: Optional[Union[SheetSelector, List[SheetSelector]]] = None, **kwargs
+    ) -> List[xypath.Table]:
+        """
+        Returns the tabs of a spreadsheet as a list of databaker tables. sheets limits them to the
+        tabs given by name, regular expression or index, in workbook order, so that the others
+        aren't parsed.
+        """
+        with self._get_simple_databaker_tabs(sheets=sheets, **kwargs) as tabs:
+            return list(tabs)
+
+    def databaker_tabs(
+        self, sheets: Optional[Union[SheetSelector, List[SheetSelector]]] = None, **kwargs
+    ) -> TabCollection:
+        """
+        As as_databaker(), but each tab is only parsed when it is first accessed, and the tab names
+        are available without parsing any of them. Close the collection (or use it as a context
+        manager) once done, to release the spreadsheet.
+        """
+        return self._get_simple_databaker_tabs(sheets=sheets, **kwargs)
+
+    def as_pandas(
+        self,
+        use_parsed_cache: Optional[bool] = None,
+        incremental: bool = False,
+        compact: bool = False,
+        **kwargs,
+    ) -> Union[Dict[str, pd.DataFrame], pd.DataFrame, Iterator[pd.DataFrame]]:
+        """
+        Returns the data as a pandas dataframe, or dictionary of dataframes for a spreadsheet.
+        Passing chunksize for a CSV distribution returns an iterator of dataframes instead, as
+        iter_pandas().
+
+        With use_parsed_cache=True, spreadsheets are kept in the parsed cache (see
+        gssutils.cache.ParsedCache), so loading the same one again with the same arguments doesn't
+        parse it again. It's off by default, unless the PARSED_CACHE env var is "on".
+
+        For an odataConversion seed, incremental=True only fetches the chunks that aren't already
+        in PMD, see get_incremental_chunks(). The new and skipped chunks are recorded in the
+        dataframe's attrs. With resume=True (or the ODATA_RESUME env var "on") the chunks fetched
+        are kept until the load completes, so that a failed load picks up where it got to, see
+        gssutils.cache.create_odata_progress().
 
-    def as_pandas(self, **kwargs) -> Union[Dict[str, pd.DataFrame], pd.DataFrame]:
+        compact=True converts every dataframe with gssutils.transform.dtypes.compact_dtypes.
+        """
+        data = self._get_pandas(use_parsed_cache, incremental, **kwargs)
+        if compact:
+            return _compacted(data)
+        return data
 
+    def _get_pandas(self, use_parsed_cache: Optional[bool], incremental: bool, **kwargs):
         if self._seed is not None:
             if "odataConversion" in self._seed.keys():
+                if incremental:
+                    return self._construct_incremental_odata_dataframe(**kwargs)
                 return self._construct_odata_dataframe(**kwargs)
 
-        return self._get_simple_csv_pandas(**kwargs)
+        if incremental:
+            raise ValueError("Only odataConversion seeds can be loaded incrementally.")
+
+        if kwargs.get("chunksize") is not None and self._mediaType == "text/csv":
+            return self.iter_pandas(**kwargs)
 
-    def _get_simple_databaker_tabs(self, **kwargs):
+        return self._get_simple_csv_pandas(use_parsed_cache=use_parsed_cache, **kwargs)
+
+    def iter_pandas(
+        self,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        usecols: Optional[list] = None,
+        dtype: Optional[Union[str, dict]] = None,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
         """
-        Given a distribution object representing a spreadsheet, attempts to return a list
-        of databaker table objects.
+        Streams a CSV distribution from the HTTP response into dataframes of at most chunksize rows,
+        so that only one chunk needs to be held in memory at a time. usecols and dtype are passed to
+        pandas.read_csv, to only keep the columns wanted and skip type inference.
+        """
+        if self._mediaType != "text/csv":
+            raise FormatError(
+                f"Unable to stream {self._mediaType} into Pandas DataFrames, only text/csv."
+            )
+        # Restore pandas < 1.2 behaviour for encoding errors
+        if "encoding" in kwargs and "encoding_errors" not in kwargs:
+            kwargs["encoding_errors"] = "replace"
+        with self.open() as csv_obj:
+            with pd.read_csv(
+                csv_obj, chunksize=chunksize, usecols=usecols, dtype=dtype, **kwargs
+            ) as reader:
+                for chunk in reader:
+                    yield chunk
+
+    def _get_simple_databaker_tabs(
+        self, sheets: Optional[Union[SheetSelector, List[SheetSelector]]] = None, **kwargs
+    ) -> TabCollection:
+        """
+        Given a distribution object representing a spreadsheet, attempts to return a lazy
+        collection of databaker table objects.
         """
-
-        with self.open() as http_response:
-            bio_fileobj = BytesIO(http_response.read())
 
         if self._mediaType == ExcelOpenXML:
-            tableset = tableset_from_xlsx(input_file_obj=bio_fileobj)
-            tabs = list(xypath.loader.get_sheets(tableset, "*"))
-            return tabs
+            tableset_from = tableset_from_xlsx
         elif self._mediaType == Excel:
-            tableset = tableset_from_xls(input_file_obj=bio_fileobj)
-            tabs = list(xypath.loader.get_sheets(tableset, "*"))
-            return tabs
+            tableset_from = tableset_from_xls
         elif self._mediaType == ODS:
-            tableset = tableset_from_ods(input_file_obj=bio_fileobj)
-            tabs = list(xypath.loader.get_sheets(tableset, "*"))
-            return tabs
+            tableset_from = tableset_from_ods
         else:
             raise FormatError(f"Unable to load {self._mediaType} into Databaker.")
 
+        if sheets is None:
+            sheets = ["*"]
+        elif not isinstance(sheets, list):
+            sheets = [sheets]
+
+        # the file is kept open for the tabs that are yet to be parsed
+        resources = ExitStack()
+        try:
+            fobj = resources.enter_context(self._open_seekable())
+            tableset = tableset_from(input_file_obj=fobj)
+            mt_tables = [
+                (index, mt_table)
+                for index, mt_table in enumerate(tableset.tables)
+                if _sheet_selected(sheets, index, mt_table.name)
+            ]
+        except BaseException:
+            resources.close()
+            raise
+        return TabCollection(mt_tables, resources)
+
+    def _read_spreadsheet(self, use_parsed_cache: Optional[bool], **kwargs):
+        """
+        pandas.read_excel the spreadsheet, by way of the parsed cache if it's used.
+        """
+        # pandas 0.25 now tries to seek(0), so the stream needs to be seekable
+        with self._open_seekable() as fobj:
+            parsed_cache = create_parsed_cache(enabled=use_parsed_cache)
+            key = None
+            if parsed_cache is not None:
+                key = parsed_cache.key(_content_hash(fobj), f"pandas {self._mediaType}", kwargs)
+            if key is None:
+                return pd.read_excel(fobj, **kwargs)
+            parsed = parsed_cache.get(key)
+            if parsed is None:
+                parsed = pd.read_excel(fobj, **kwargs)
+                parsed_cache.set(key, parsed)
+            return parsed
+
     def _get_simple_csv_pandas(
-        self, **kwargs
+        self, use_parsed_cache: Optional[bool] = None, **kwargs
     ) -> Union[Dict[str, pd.DataFrame], pd.DataFrame]:
         """
         Given a distribution object, attempts to return the data as a pandas dataframe
         or dictionary of dataframes (in the case of a spreadsheet source)
         """
         if self._mediaType in ExcelTypes:
-            with self.open() as fobj:
-                # pandas 0.25 now tries to seek(0), so we need to read and buffer the stream
-                buffered_fobj = BytesIO(fobj.read())
-                return pd.read_excel(buffered_fobj, **kwargs)
+            return self._read_spreadsheet(use_parsed_cache, **kwargs)
         elif self._mediaType == ODS:
-            with self.open() as fobj:
-                buffered_fobj = BytesIO(fobj.read())
-                df_dict = pd.read_excel(buffered_fobj, engine="odf", sheet_name=None)
-                if "sheet_name" in kwargs:
-                    return df_dict[kwargs["sheet_name"]]
-                return df_dict
+            df_dict = self._read_spreadsheet(use_parsed_cache, engine="odf", sheet_name=None)
+            if "sheet_name" in kwargs:
+                return df_dict[kwargs["sheet_name"]]
+            return df_dict
         elif self._mediaType == "text/csv":
             with self.open() as csv_obj:
                 # Restore pandas < 1.2 behaviour for encoding errors
@@ -111,36 +427,66 @@ class Downloadable(Resource):
                 f"Unable to load {self._mediaType} into Pandas DataFrame."
             )
 
-    def _get_principle_dataframe(self, chunks_wanted: Optional[list] = None):
+    def _get_principle_dataframe(
+        self, chunks_wanted: Optional[list] = None, resume: Optional[bool] = None
+    ):
         """
         Given a distribution object and a list of chunks of data we want
         return a dataframe
         """
 
-        principle_df = pd.DataFrame()
-
         if chunks_wanted is not None:
-            key = self._seed["odataConversion"]["chunkColumn"]
-
-            if type(chunks_wanted) is list:
-                for chunk in chunks_wanted:
-                    principle_df = principle_df.append(
-                        self._get_odata_data(
-                            self.uri, params={"$filter": f"{key} eq {chunk}"}
-                        )
-                    )
-            else:
-                chunk = str(chunks_wanted)
-                principle_df = principle_df.append(
-                    self._get_odata_data(
-                        self.uri, params={"$filter": f"{key} eq {chunk}"}
+            if type(chunks_wanted) is not list:
+                chunks_wanted = [str(chunks_wanted)]
+            progress = create_odata_progress(enabled=resume)
+            # the chunks are independent of each other, so fetch several at once
+            chunk_workers, page_workers = _odata_worker_split(len(chunks_wanted))
+            with ThreadPoolExecutor(max_workers=chunk_workers) as executor:
+                chunk_dfs = list(
+                    executor.map(
+                        lambda chunk: self._get_odata_chunk(chunk, progress, page_workers),
+                        chunks_wanted,
                     )
                 )
+            principle_df = pd.concat(chunk_dfs) if len(chunk_dfs) > 0 else pd.DataFrame()
+            if progress is not None:
+                # every chunk's been fetched, so a later load should start afresh
+                self._clear_odata_progress(progress, chunks_wanted)
         else:
             principle_df = self._get_odata_data(self.uri)
 
         return principle_df
 
+    def _odata_chunk_filter(self, chunk) -> str:
+        return f"{self._seed['odataConversion']['chunkColumn']} eq {chunk}"
+
+    @backoff.on_exception(
+        backoff.expo,
+        (ODataError, requests.exceptions.RequestException),
+        max_tries=_odata_chunk_tries,
+    )
+    def _get_odata_chunk(
+        self, chunk, progress: Optional[ParsedCache], max_workers: int
+    ) -> pd.DataFrame:
+        chunk_filter = self._odata_chunk_filter(chunk)
+        chunk_df = None
+        if progress is not None:
+            progress_key = progress.key(self.uri, "odata", {"$filter": chunk_filter})
+            chunk_df = progress.get(progress_key)
+        if chunk_df is None:
+            chunk_df = self._get_odata_data(
+                self.uri, params={"$filter": chunk_filter}, max_workers=max_workers
+            )
+            if progress is not None:
+                progress.set(progress_key, chunk_df)
+        return chunk_df
+
+    def _clear_odata_progress(self, progress: ParsedCache, chunks_wanted: list):
+        for chunk in chunks_wanted:
+            progress.delete(
+                progress.key(self.uri, "odata", {"$filter": self._odata_chunk_filter(chunk)})
+            )
+
     def _get_supplementary_dataframes(self) -> dict:
         """
         Supplement the base dataframe with expand and foreign principle_df calls etc
@@ -148,42 +494,87 @@ class Downloadable(Resource):
 
         sup = self._seed["odataConversion"]["supplementalEndpoints"]
 
-        sup_dfs = {}
-
-        for name, sup_dict in sup.items():
-            sup_dfs[name] = self._get_odata_data(sup_dict["endpoint"])
+        endpoint_workers, page_workers = _odata_worker_split(len(sup))
+        with ThreadPoolExecutor(max_workers=endpoint_workers) as executor:
+            sup_dfs = dict(
+                zip(
+                    sup.keys(),
+                    executor.map(
+                        lambda sup_dict: self._get_odata_data(
+                            sup_dict["endpoint"], max_workers=page_workers
+                        ),
+                        sup.values(),
+                    ),
+                )
+            )
 
         return sup_dfs
 
     @backoff.on_exception(
         backoff.expo, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
     )
-    def _get_odata_data(
-        self, url: str, params: Optional[dict] = None
-    ) -> pd.DataFrame():
+    def _get_odata_page(self, url: str, params: Optional[dict] = None) -> dict:
         r = self._session.get(url, params=params)
         logging.info(f"Trying {url} with params {params}")
         if r.status_code != 200:
-            raise Exception(
+            raise ODataError(
                 f"Failed to get data from {url} with status code {r.status_code}"
             )
+        return r.json()
 
-        contents = r.json()
-        df = pd.DataFrame(contents["value"])
+    def _get_odata_data(
+        self, url: str, params: Optional[dict] = None, max_workers: Optional[int] = None
+    ) -> pd.DataFrame():
+        """
+        Gets every page of an OData query as one dataframe, following the next links.
 
-        # This one supports OData (Stat Wales)
-        while "odata.nextLink" in contents.keys():
-            page = self._session.get(contents["odata.nextLink"])
-            contents = page.json()
-            df = df.append(pd.DataFrame(contents["value"]))
+        With max_workers (by default ODATA_MAX_WORKERS) > 1, and next links that page with $skip,
+        the remaining pages are fetched that many at a time rather than one after another.
+        """
+        contents = self._get_odata_page(url, params)
+        pages = [contents["value"]]
+        next_link = _odata_next_link(contents)
+        if max_workers is None:
+            max_workers = _odata_max_workers()
+
+        if (
+            next_link is not None
+            and max_workers > 1
+            and len(pages[0]) > 0
+            and _odata_skip(next_link) == len(pages[0])
+        ):
+            pages.extend(self._get_odata_pages_concurrently(next_link, max_workers))
+        else:
+            while next_link is not None:
+                contents = self._get_odata_page(next_link)
+                pages.append(contents["value"])
+                next_link = _odata_next_link(contents)
 
-        # This one supports OData (HMRC Trade UK API)
-        while "@odata.nextLink" in contents.keys():
-            page = self._session.get(contents["@odata.nextLink"])
-            contents = page.json()
-            df = df.append(pd.DataFrame(contents["value"]))
+        # concatenate once, rather than copying everything so far for every page
+        return pd.concat([pd.DataFrame(page) for page in pages])
 
-        return df
+    def _get_odata_pages_concurrently(self, next_link: str, max_workers: int) -> List[list]:
+        """
+        Gets the pages from next_link on, by stepping its $skip by the page size, max_workers pages
+        at a time, until a page is short or has no next link.
+        """
+        page_size = _odata_skip(next_link)
+        pages = []
+        skip = page_size
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                links = [
+                    _odata_with_skip(next_link, skip + i * page_size)
+                    for i in range(max_workers)
+                ]
+                for contents in executor.map(self._get_odata_page, links):
+                    pages.append(contents["value"])
+                    if (
+                        len(contents["value"]) < page_size
+                        or _odata_next_link(contents) is None
+                    ):
+                        return pages
+                skip += max_workers * page_size
 
     def _merge_principle_supplementary_dataframes(
         self, principle_df, supplementary_df_dict
@@ -209,7 +600,9 @@ class Downloadable(Resource):
 
         return principle_df
 
-    def _construct_odata_dataframe(self, chunks_wanted: Optional[list] = None):
+    def _construct_odata_dataframe(
+        self, chunks_wanted: Optional[list] = None, resume: Optional[bool] = None
+    ):
         """
         Construct a dataframe via a series of api calls.
         """
@@ -221,7 +614,7 @@ class Downloadable(Resource):
             )
 
         # use those chunks to construct the principle dataframe
-        principle_df = self._get_principle_dataframe(chunks_wanted)
+        principle_df = self._get_principle_dataframe(chunks_wanted, resume)
 
         # expand this dataframe with supplementary data
         supplementary_df_dict = self._get_supplementary_dataframes()
@@ -233,6 +626,59 @@ class Downloadable(Resource):
 
         return df
 
+    def _construct_incremental_odata_dataframe(
+        self, pmd_chunks: Optional[list] = None, resume: Optional[bool] = None
+    ):
+        """
+        Construct a dataframe of only the chunks that aren't in PMD yet.
+        """
+        new_chunks, skipped_chunks = self.get_incremental_chunks(pmd_chunks)
+        logging.info(
+            f"Fetching {len(new_chunks)} new chunks of {self.uri}, "
+            f"skipping {len(skipped_chunks)} already in PMD: {skipped_chunks}"
+        )
+        if len(new_chunks) > 0:
+            df = self._construct_odata_dataframe(new_chunks, resume)
+        else:
+            df = pd.DataFrame()
+        df.attrs["new_chunks"] = new_chunks
+        df.attrs["skipped_chunks"] = skipped_chunks
+        return df
+
+    def _pmd_chunk(self, chunk) -> str:
+        """
+        The value of chunkDimension in PMD for a chunk of the odata api, given by the seed's
+        chunkURITemplate. This can use {chunk}, and also {year} and {month} for a YYYYMM chunk.
+        """
+        template = self._seed["odataConversion"].get(
+            "chunkURITemplate", DEFAULT_CHUNK_URI_TEMPLATE
+        )
+        chunk = str(chunk)
+        fields = {"chunk": chunk}
+        if re.fullmatch(r"\d{6}", chunk):
+            fields["year"], fields["month"] = chunk[:4], chunk[4:]
+        try:
+            return template.format(**fields)
+        except KeyError:
+            return chunk
+
+    def get_incremental_chunks(self, pmd_chunks: Optional[list] = None) -> Tuple[list, list]:
+        """
+        Splits the chunks on the odata api into those that are new, and those that PMD already has,
+        in that order. pmd_chunks can be given, e.g. from an earlier get_pmd_chunks() or a local
+        stand-in for the triple store, rather than being queried from SPARQL_URL.
+        """
+        if pmd_chunks is None:
+            pmd_chunks = self.get_pmd_chunks()
+        published = set(pmd_chunks)
+        new_chunks, skipped_chunks = [], []
+        for chunk in sorted(set(self.get_odata_api_chunks())):
+            if self._pmd_chunk(chunk) in published:
+                skipped_chunks.append(chunk)
+            else:
+                new_chunks.append(chunk)
+        return new_chunks, skipped_chunks
+
     def get_pmd_chunks(self) -> list:
         """
         Given the downloadURL from the scraper, return a list of chunks from pmd4
@@ -275,6 +721,50 @@ SELECT DISTINCT ?chunk WHERE {{
             raise Exception(f"failed on url {self.uri} with code {r.status_code}")
         chunk_dict = r.json()
 
-        chunks = [x["MonthId"] for x in chunk_dict["value"]]
+        chunks = [x[chunk_column] for x in chunk_dict["value"]]
 
         return chunks
+
+
+# Media types of the files found in ZIP distributions, by extension, where mimetypes doesn't agree
+_MEMBER_MEDIA_TYPES = {
+    ".csv": CSV,
+    ".xls": Excel,
+    ".xlsx": ExcelOpenXML,
+    ".ods": ODS,
+    ".zip": ZIP,
+}
+
+
+class _ZipArchive:
+    """
+    An open ZIP archive, closed along with the file it's read from once none of its members are
+    referenced any more.
+    """
+
+    def __init__(self, resources: ExitStack, fobj):
+        self.zipfile = resources.enter_context(zipfile.ZipFile(fobj))
+        self._finalizer = weakref.finalize(self, resources.close)
+
+
+class ZipMember(Downloadable):
+    """
+    A file in a ZIP distribution, see Downloadable.members(). It is read from the archive, and
+    decompressed, only when it is loaded.
+    """
+
+    def __init__(self, archive: _ZipArchive, info: zipfile.ZipInfo, archive_uri: str):
+        super().__init__()
+        self._archive = archive
+        self.name = info.filename
+        self.size = info.file_size
+        self.compressed_size = info.compress_size
+        self.uri = f"{archive_uri}#{quote(info.filename)}"
+        suffix = Path(info.filename).suffix.lower()
+        self._mediaType = _MEMBER_MEDIA_TYPES.get(suffix, mimetypes.guess_type(info.filename)[0])
+
+    def open(self):
+        return self._archive.zipfile.open(self.name)
+
+    def __repr__(self):
+        return f"ZipMember({self.name!r}, size={self.size})"
@@ -0,0 +1,82 @@
+"""
+Compact dtypes for downloaded tables, where tidy data with millions of rows of repeated labels
+would otherwise be held as Python strings and 64 bit numbers.
+"""
+import importlib.util
+import logging
+from typing import Dict
+
+import pandas as pd
+
+# Object columns with at most this ratio of distinct values to rows become categories.
+DEFAULT_MAX_CATEGORY_RATIO = 0.5
+
+
+def _arrow_strings_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _compact_numeric(column: pd.Series) -> pd.Series:
+    if pd.api.types.is_integer_dtype(column):
+        return pd.to_numeric(column, downcast="integer")
+    if pd.api.types.is_float_dtype(column):
+        downcast = pd.to_numeric(column, downcast="float")
+        # only keep float32 where it is exact, so that the values written out don't change
+        if downcast.dtype != column.dtype and not (
+            (downcast.astype(column.dtype) == column) | column.isna()
+        ).all():
+            return column
+        return downcast
+    return column
+
+
+def _compact_object(column: pd.Series, max_category_ratio: float) -> pd.Series:
+    if len(column) == 0:
+        return column
+    if column.nunique(dropna=True) <= max_category_ratio * len(column):
+        return column.astype("category")
+    if (
+        pd.api.types.is_object_dtype(column)
+        and _arrow_strings_available()
+        and pd.api.types.infer_dtype(column, skipna=True) == "string"
+    ):
+        return column.astype("string[pyarrow]")
+    return column
+
+
+def compact_dtypes(
+    df: pd.DataFrame, max_category_ratio: float = DEFAULT_MAX_CATEGORY_RATIO
+) -> pd.DataFrame:
+    """
+    Returns a copy of df with low cardinality object columns as categories, other string columns
+    as pyarrow backed strings (where pyarrow is installed) and numbers downcast to the smallest
+    dtype that holds them exactly.
+
+    How much memory was saved is logged and kept in the `compact` entry of the result's attrs.
+    """
+    before = int(df.memory_usage(index=True, deep=True).sum())
+    compacted = df.copy()
+    changed: Dict[str, str] = {}
+    for name in df.columns:
+        column = df[name]
+        if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+            new_column = _compact_numeric(column)
+        elif pd.api.types.is_object_dtype(column) or isinstance(column.dtype, pd.StringDtype):
+            new_column = _compact_object(column, max_category_ratio)
+        else:
+            continue
+        if new_column.dtype != column.dtype:
+            compacted[name] = new_column
+            changed[str(name)] = f"{column.dtype} -> {new_column.dtype}"
+    after = int(compacted.memory_usage(index=True, deep=True).sum())
+
+    compacted.attrs["compact"] = {
+        "bytes_before": before,
+        "bytes_after": after,
+        "columns": changed,
+    }
+    logging.info(
+        f"Compacted dataframe from {before / 1e6:.1f}MB to {after / 1e6:.1f}MB, "
+        f"{len(changed)} columns changed"
+    )
+    return compacted
@@ -5,7 +5,6 @@ from pathlib import Path
 
 from typing import Union, Sequence, Any, List
 
-import vcr
 from unidecode import unidecode
 
 
@@ -34,6 +33,7 @@ def recordable(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
         if 'RECORD_MODE' in os.environ:
+            import vcr  # only needed when recording fixtures, and slow to import
             with vcr.use_cassette(str(Path('fixtures') / 'recording.yml'), record_mode=os.environ['RECORD_MODE']):
                 return f(*args, **kwargs)
         else:
@@ -0,0 +1,122 @@
+import time
+
+import msgpack
+import pandas as pd
+
+from gssutils.cache import BLOB_RECORD_PREFIX, ParsedCache, SQLiteCache, create_cache, create_parsed_cache
+
+
+def test_sqlite_cache_round_trip(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite")
+    cache.set("https://www.ons.gov.uk/data", b"body")
+    assert cache.get("https://www.ons.gov.uk/data") == b"body"
+    cache.delete("https://www.ons.gov.uk/data")
+    assert cache.get("https://www.ons.gov.uk/data") is None
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite", max_size=10)
+    cache.set("https://example.org/a", b"aaaa")
+    cache.set("https://example.org/b", b"bbbb")
+    time.sleep(0.01)
+    cache.get("https://example.org/a")
+    cache.set("https://example.org/c", b"cccc")
+    assert cache.get("https://example.org/b") is None
+    assert cache.get("https://example.org/a") == b"aaaa"
+    assert cache.get("https://example.org/c") == b"cccc"
+
+
+def test_sqlite_cache_ttl_per_host(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite", host_ttl={"www.ons.gov.uk": 0})
+    cache.set("https://www.ons.gov.uk/data", b"body")
+    cache.set("https://www.gov.uk/data", b"body")
+    time.sleep(0.01)
+    assert cache.get("https://www.ons.gov.uk/data") is None
+    assert cache.get("https://www.gov.uk/data") == b"body"
+
+
+def test_parsed_cache_round_trip(tmp_path):
+    cache = ParsedCache(tmp_path / "parsed")
+    key = cache.key("abc123", "pandas", {"sheet_name": "Table 1"})
+    assert key != cache.key("abc123", "pandas", {"sheet_name": "Table 2"})
+    assert cache.get(key) is None
+    df = pd.DataFrame({"Value": [1, 2, 3]})
+    cache.set(key, df)
+    assert cache.get(key).equals(df)
+
+
+def test_parsed_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.delenv("PARSED_CACHE", raising=False)
+    assert create_parsed_cache(str(tmp_path)) is None
+    assert create_parsed_cache(str(tmp_path), enabled=True) is not None
+    monkeypatch.setenv("PARSED_CACHE", "on")
+    assert create_parsed_cache(str(tmp_path)) is not None
+    assert create_parsed_cache(str(tmp_path), enabled=False) is None
+
+
+def test_parsed_cache_has_no_key_for_unserializable_arguments():
+    assert ParsedCache.key("abc123", "pandas", {"converters": {"Value": str}}) is None
+    assert ParsedCache.key("abc123", "pandas", {"sheet_name": ["Table 1"]}) is not None
+
+
+def test_parsed_cache_evicts_least_recently_used(tmp_path):
+    cache = ParsedCache(tmp_path / "parsed")
+    cache.set("a", b"a" * 100)
+    cache.max_size = (tmp_path / "parsed" / "a.pickle").stat().st_size * 2
+    time.sleep(0.01)
+    cache.set("b", b"b" * 100)
+    time.sleep(0.01)
+    cache.get("a")
+    cache.set("c", b"c" * 100)
+    assert cache.get("b") is None
+    assert cache.get("a") == b"a" * 100
+    assert cache.get("c") == b"c" * 100
+
+
+def test_parsed_cache_ignores_unreadable_entries(tmp_path):
+    cache = ParsedCache(tmp_path / "parsed")
+    (tmp_path / "parsed" / "broken.pickle").write_bytes(b"not a pickle")
+    assert cache.get("broken") is None
+    assert not (tmp_path / "parsed" / "broken.pickle").exists()
+
+
+def test_sqlite_cache_host_ttl_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_CACHE_HOST_TTL", "www.ons.gov.uk=60, api.beta.ons.gov.uk=0.5")
+    cache = create_cache("sqlite", str(tmp_path))
+    assert cache.host_ttl == {"www.ons.gov.uk": 60, "api.beta.ons.gov.uk": 0.5}
+    assert create_cache("sqlite", str(tmp_path), host_ttl={}).host_ttl == {}
+
+
+def test_sqlite_cache_skips_entries_bigger_than_max_size(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite", max_size=10)
+    cache.set("https://example.org/a", b"aaaa")
+    cache.set("https://example.org/big", b"b" * 11)
+    assert cache.get("https://example.org/big") is None
+    assert cache.get("https://example.org/a") == b"aaaa"
+
+
+def _blob_record(blob_dir, name: str, body: bytes) -> bytes:
+    blob_dir.mkdir(exist_ok=True)
+    (blob_dir / name).write_bytes(body)
+    return BLOB_RECORD_PREFIX + msgpack.dumps({"blob": name}, use_bin_type=True)
+
+
+def test_sqlite_cache_counts_and_deletes_blobs(tmp_path):
+    blob_dir = tmp_path / "blobs"
+    cache = SQLiteCache(tmp_path / "cache.sqlite", max_size=150, blob_dir=blob_dir)
+    shared = _blob_record(blob_dir, "shared", b"s" * 40)
+    cache.set("https://example.org/a", shared)
+    cache.set("https://example.org/a-again", shared)
+    time.sleep(0.01)
+    # over max_size with the blob counted, so not cached and its blob deleted
+    cache.set("https://example.org/huge", _blob_record(blob_dir, "huge", b"h" * 200))
+    assert cache.get("https://example.org/huge") is None
+    assert not (blob_dir / "huge").exists()
+
+    # evicts the least recently used a, but its blob is still referred to by a-again
+    cache.set("https://example.org/b", _blob_record(blob_dir, "b", b"b" * 50))
+    assert cache.get("https://example.org/a") is None
+    assert (blob_dir / "shared").exists()
+    cache.delete("https://example.org/a-again")
+    assert not (blob_dir / "shared").exists()
+    assert (blob_dir / "b").exists()
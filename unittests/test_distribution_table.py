@@ -0,0 +1,74 @@
+import gc
+from types import SimpleNamespace
+
+import pytest
+from rdflib import URIRef
+
+from gssutils.metadata import dcat, pmdcat
+from gssutils.metadata.mimetype import CSV, Excel
+from gssutils.scrape import FilterError, Scraper
+
+SCRAPER = SimpleNamespace(session=None, seed=None)
+ARCHIVE = "https://www.uktradeinfo.com/Statistics/Tax%20and%20Duty%20Bulletins"
+
+
+def _table(releases: int = 3) -> dcat.DistributionTable:
+    table = dcat.DistributionTable(SCRAPER)
+    for month in range(1, releases + 1):
+        table.add(
+            downloadURL=f"{ARCHIVE}/Alcohol{month:02}19.xls",
+            mediaType=Excel,
+            title=f"Alcohol Bulletin {month:02}/2019",
+        )
+    return table
+
+
+def test_rows_are_materialised_as_distributions():
+    table = _table()
+    assert len(table) == 3
+    distribution = table[-1]
+    assert isinstance(distribution, dcat.Distribution)
+    assert distribution.uri == f"{ARCHIVE}/Alcohol0319.xls"
+    assert distribution._mediaType == Excel
+    assert table[2] is distribution
+    assert [d.title for d in table[:2]] == ["Alcohol Bulletin 01/2019", "Alcohol Bulletin 02/2019"]
+    with pytest.raises(IndexError):
+        table[3]
+    with pytest.raises(AttributeError):
+        table.add(colour="blue")
+
+
+def test_changes_are_written_back_when_released():
+    table = _table()
+    appended = dcat.Distribution(SCRAPER)
+    appended.downloadURL = f"{ARCHIVE}/Alcohol0419.csv"
+    table.append(appended)
+    appended.mediaType = CSV  # after it was appended
+    table[0].description = "Monthly alcohol duty receipts"
+    del appended
+    gc.collect()
+
+    assert table[0].description == "Monthly alcohol duty receipts"
+    assert table[3].mediaType == CSV
+
+
+def test_filtering_only_materialises_matches():
+    table = _table()
+    assert Scraper._filter_one(table, title="Alcohol Bulletin 02/2019").downloadURL.endswith("0219.xls")
+    assert Scraper._filter_one(table, downloadURL=lambda u: u.endswith("0319.xls")).title == "Alcohol Bulletin 03/2019"
+    assert len(table._live) == 0
+    with pytest.raises(FilterError):
+        Scraper._filter_one(table, mediaType=Excel)
+    with pytest.raises(FilterError):
+        Scraper._filter_one(table, title="Nothing")
+
+
+def test_tables_are_described_like_lists():
+    dataset = pmdcat.Dataset(f"{ARCHIVE}/TaxAndDutybulletins.aspx")
+    dataset.uri = "http://gss-data.org.uk/data/alcohol-bulletin"
+    dataset.set_containing_graph("http://gss-data.org.uk/graph/alcohol-bulletin-metadata")
+    dataset.distribution = list(_table())
+    as_list = set(dataset.quads())
+    dataset.distribution = _table()
+    assert set(dataset.quads()) == as_list
+    assert dataset.get_property(dcat.DCAT.distribution)[0] == URIRef(f"{ARCHIVE}/Alcohol0119.xls")
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from gssutils.transform.dtypes import compact_dtypes
+
+
+def test_compact_dtypes():
+    df = pd.DataFrame(
+        {
+            "Period": ["2021-01", "2021-02"] * 50,
+            "Label": [f"label {i}" for i in range(100)],
+            "Count": range(100),
+            "Value": [0.5] * 100,
+            "Rate": [0.1] * 100,
+        }
+    )
+    compacted = compact_dtypes(df)
+    assert compacted["Period"].dtype == "category"
+    assert compacted["Count"].dtype == "int8"
+    assert compacted["Value"].dtype == "float32"
+    # 0.1 isn't exact as a float32, so would be written out differently
+    assert compacted["Rate"].dtype == "float64"
+    assert compacted.attrs["compact"]["bytes_after"] < compacted.attrs["compact"]["bytes_before"]
+    assert compacted.to_csv(index=False) == df.to_csv(index=False)
@@ -0,0 +1,117 @@
+import re
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from gssutils.metadata import dcat, pmdcat
+from gssutils.metadata.index import Between, MetadataIndex, Prefix
+from gssutils.metadata.mimetype import CSV, Excel
+from gssutils.scrape import FilterError, Scraper
+
+SCRAPER = SimpleNamespace(session=None, seed=None)
+BASE = "https://www.gov.uk/government/uploads/system/uploads/attachment_data/file"
+
+
+def _distributions():
+    distributions = []
+    for n, (issued, media_type) in enumerate([
+        (date(2021, 3, 18), Excel),
+        (date(2021, 3, 18), CSV),
+        (date(2020, 12, 17), Excel),
+        (date(2020, 9, 17), CSV),
+    ]):
+        distribution = dcat.Distribution(SCRAPER)
+        distribution.downloadURL = f"{BASE}/{n}/ras51001.{'csv' if media_type == CSV else 'xlsx'}"
+        distribution.title = f"RAS51001 release {n}"
+        distribution.issued = issued
+        distribution.mediaType = media_type
+        distributions.append(distribution)
+    return distributions
+
+
+def test_select_with_each_kind_of_filter():
+    distributions = _distributions()
+    index = MetadataIndex(distributions)
+
+    assert list(index.select(mediaType=CSV)) == [distributions[1], distributions[3]]
+    assert list(index.select(title=Prefix("RAS51001 release 2"))) == [distributions[2]]
+    assert list(index.select(downloadURL=re.compile(r".*\.csv"), issued=date(2021, 3, 18))) == [distributions[1]]
+    assert list(index.select(issued=Between(date(2020, 10, 1)))) == distributions[:3]
+    assert list(index.select(issued=Between(end=date(2020, 12, 17)), mediaType=Excel)) == [distributions[2]]
+    assert list(index.select(title=lambda t: t.endswith("3"))) == [distributions[3]]
+    assert len(index.select(description="anything")) == 0
+    assert index.select(mediaType=Excel).latest() is distributions[0]
+    assert index.select(mediaType=Excel).where(issued=Between(end=date(2021, 1, 1)))[0] is distributions[2]
+
+
+def test_one_of_keeps_filter_one_semantics():
+    distributions = _distributions()
+    index = MetadataIndex(distributions)
+    assert Scraper._one_of(index, latest=True) is distributions[0]
+    assert Scraper._one_of(index, mediaType=CSV, latest=True) is distributions[1]
+    with pytest.raises(FilterError):
+        Scraper._one_of(index, mediaType=CSV)
+    with pytest.raises(FilterError):
+        Scraper._one_of(index, mediaType="application/pdf")
+    # without an issued date for every match, the first is taken
+    undated = dcat.Distribution(SCRAPER)
+    undated.mediaType = CSV
+    assert Scraper._filter_one([undated] + distributions, mediaType=CSV, latest=True) is undated
+
+
+def test_index_goes_stale_when_metadata_changes():
+    distributions = _distributions()
+    index = MetadataIndex(distributions)
+    assert index.is_current(distributions)
+    distributions[3].mediaType = Excel
+    assert not index.is_current(distributions)
+    index = MetadataIndex(distributions)
+    distributions.append(dcat.Distribution(SCRAPER))
+    assert not index.is_current(distributions)
+
+
+def test_distribution_tables_are_indexed_in_place():
+    table = dcat.DistributionTable(SCRAPER, _distributions())
+    index = MetadataIndex(table)
+    assert [d.title for d in index.select(mediaType=CSV)] == ["RAS51001 release 1", "RAS51001 release 3"]
+
+
+def test_latest_only_compares_the_matches():
+    distributions = _distributions()
+    # not comparable with the dates of the others, but never a candidate
+    distributions[2].issued = datetime(2020, 12, 17, 9, 30)
+    index = MetadataIndex(distributions)
+    assert index.select(mediaType=CSV).latest() is distributions[1]
+
+
+def test_a_single_dataset_is_indexed_once():
+    scraper = Scraper.__new__(Scraper)
+    scraper._indexes = {}
+    scraper.catalog = dcat.Catalog()
+    scraper.catalog.dataset = pmdcat.Dataset("https://www.gov.uk/government/statistics/ras51001")
+    scraper.catalog.dataset.title = "RAS51001"
+    assert list(scraper.datasets_where(title="RAS51001")) == [scraper.catalog.dataset]
+    index = scraper._index("datasets", scraper.catalog.dataset)
+    assert scraper._index("datasets", scraper.catalog.dataset) is index
+
+
+def test_index_goes_stale_when_distributions_are_reordered():
+    scraper = Scraper.__new__(Scraper)
+    scraper._indexes = {}
+    scraper.distributions = _distributions()
+    latest = scraper.distribution(latest=True)
+    assert latest is scraper.distributions[0]
+
+    scraper.distributions.sort(key=lambda d: d.issued)
+    assert not scraper._indexes["distributions"].is_current(scraper.distributions)
+    assert scraper.distribution(latest=True) is latest
+    assert scraper.distribution(mediaType=CSV, latest=True).title == "RAS51001 release 1"
+
+    scraper.distributions[0] = scraper.distributions[1]
+    with pytest.raises(FilterError):
+        scraper.distribution(title="RAS51001 release 3")
+    # one index for the distributions, however many lists they've been
+    scraper.distributions = list(reversed(scraper.distributions))
+    assert scraper.distribution(mediaType=CSV).title == "RAS51001 release 1"
+    assert list(scraper._indexes) == ["distributions"]
@@ -0,0 +1,196 @@
+import os
+import re
+import threading
+import time
+
+import pytest
+
+from gssutils.transform.download import Downloadable, ODataError
+
+PAGE_SIZE = 5
+ROWS = [{"MonthId": 202101, "Value": i} for i in range(23)]
+
+
+class _PagedResponse:
+    status_code = 200
+
+    def __init__(self, contents):
+        self._contents = contents
+
+    def json(self):
+        return self._contents
+
+
+class _PagedSession:
+    """
+    Serves ROWS as an OData feed, PAGE_SIZE rows at a time with $skip next links.
+    """
+
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url, params=None):
+        self.requested.append(url)
+        match = re.search(r"\$skip=(\d+)", url)
+        skip = int(match.group(1)) if match else 0
+        contents = {"value": ROWS[skip : skip + PAGE_SIZE]}
+        if skip + PAGE_SIZE < len(ROWS):
+            contents["@odata.nextLink"] = f"https://api.example.org/OTS?$skip={skip + PAGE_SIZE}"
+        return _PagedResponse(contents)
+
+
+@pytest.mark.parametrize("max_workers", ["1", "4"])
+def test_odata_pages_are_concatenated_in_order(monkeypatch, max_workers):
+    monkeypatch.setenv("ODATA_MAX_WORKERS", max_workers)
+    downloadable = Downloadable()
+    downloadable._session = _PagedSession()
+    df = downloadable._get_odata_data("https://api.example.org/OTS")
+    assert list(df["Value"]) == list(range(23))
+    assert len(set(downloadable._session.requested)) == len(downloadable._session.requested)
+
+
+class _ChunkedSession:
+    """
+    Serves one page of rows per MonthId $filter, failing for the months in `failing`.
+    """
+
+    def __init__(self, failing=(), months=()):
+        self.failing = set(failing)
+        self.months = list(months)
+        self.filters = []
+
+    def get(self, url, params=None):
+        if "$apply" in params:
+            return _PagedResponse({"value": [{"MonthId": month} for month in self.months]})
+        month = int(params["$filter"].split(" eq ")[1])
+        self.filters.append(params["$filter"])
+        if month in self.failing:
+            response = _PagedResponse({})
+            response.status_code = 503
+            return response
+        return _PagedResponse({"value": [{"MonthId": month, "Value": month % 100}]})
+
+
+def _chunked_downloadable(session):
+    downloadable = Downloadable()
+    downloadable.uri = "https://api.example.org/OTS"
+    downloadable._seed = {"odataConversion": {"chunkColumn": "MonthId", "supplementalEndpoints": {}}}
+    downloadable._session = session
+    return downloadable
+
+
+def test_odata_chunks_are_fetched_concurrently_in_order(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ODATA_MAX_WORKERS", "4")
+    months = [202101 + i for i in range(10)]
+    df = _chunked_downloadable(_ChunkedSession())._construct_odata_dataframe(months)
+    assert list(df["MonthId"]) == months
+
+
+def _fail_on_the_last_month(months, resume=None):
+    failing = _ChunkedSession(failing=months[-1:])
+    with pytest.raises(ODataError):
+        _chunked_downloadable(failing)._construct_odata_dataframe(months, resume=resume)
+
+
+def test_odata_chunks_resume_after_a_failure(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ODATA_CHUNK_TRIES", "1")
+    monkeypatch.setenv("ODATA_RESUME", "on")
+    months = [202101, 202102, 202103]
+    _fail_on_the_last_month(months)
+
+    resumed = _ChunkedSession()
+    df = _chunked_downloadable(resumed)._construct_odata_dataframe(months)
+    assert resumed.filters == ["MonthId eq 202103"]
+    assert list(df["MonthId"]) == months
+
+    # a completed load doesn't leave its progress behind
+    again = _ChunkedSession()
+    _chunked_downloadable(again)._construct_odata_dataframe(months)
+    assert len(again.filters) == len(months)
+
+
+def test_odata_chunks_only_resume_when_asked(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ODATA_CHUNK_TRIES", "1")
+    monkeypatch.delenv("ODATA_RESUME", raising=False)
+    months = [202101, 202102, 202103]
+    _fail_on_the_last_month(months)
+    assert not (tmp_path / ".cache" / "odata-progress").exists()
+
+    _fail_on_the_last_month(months, resume=True)
+    resumed = _ChunkedSession()
+    _chunked_downloadable(resumed)._construct_odata_dataframe(months, resume=True)
+    assert resumed.filters == ["MonthId eq 202103"]
+
+
+def test_stale_odata_chunks_are_fetched_again(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ODATA_CHUNK_TRIES", "1")
+    monkeypatch.setenv("ODATA_RESUME", "on")
+    monkeypatch.setenv("ODATA_RESUME_MAX_AGE", "3600")
+    months = [202101, 202102, 202103]
+    _fail_on_the_last_month(months)
+
+    # one of the two months fetched was fetched two hours ago
+    progress = sorted((tmp_path / ".cache" / "odata-progress").iterdir())
+    assert len(progress) == 2
+    stale = time.time() - 2 * 60 * 60
+    os.utime(progress[0], (stale, stale))
+
+    resumed = _ChunkedSession()
+    df = _chunked_downloadable(resumed)._construct_odata_dataframe(months)
+    assert len(resumed.filters) == 2 and "MonthId eq 202103" in resumed.filters
+    assert list(df["MonthId"]) == months
+
+
+class _BusyChunkedSession:
+    """
+    Serves ROWS as a paged OData feed per MonthId $filter, keeping count of the most requests made
+    at once.
+    """
+
+    def __init__(self):
+        self.active = 0
+        self.most_active = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None):
+        with self._lock:
+            self.active += 1
+            self.most_active = max(self.most_active, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        if params is not None:
+            month, skip = int(params["$filter"].split(" eq ")[1]), 0
+        else:
+            month, skip = map(int, re.search(r"month=(\d+)&\$skip=(\d+)", url).groups())
+        contents = {"value": [dict(row, MonthId=month) for row in ROWS[skip : skip + PAGE_SIZE]]}
+        if skip + PAGE_SIZE < len(ROWS):
+            contents["@odata.nextLink"] = f"https://api.example.org/OTS?month={month}&$skip={skip + PAGE_SIZE}"
+        return _PagedResponse(contents)
+
+
+def test_odata_chunks_and_pages_share_the_max_workers(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ODATA_MAX_WORKERS", "4")
+    session = _BusyChunkedSession()
+    df = _chunked_downloadable(session)._get_principle_dataframe([202101, 202102], resume=True)
+    assert list(df["MonthId"]) == [202101] * len(ROWS) + [202102] * len(ROWS)
+    assert list(df["Value"]) == list(range(len(ROWS))) * 2
+    assert 1 < session.most_active <= 4
+    # the chunks were all fetched, so their progress is gone
+    assert list((tmp_path / ".cache" / "odata-progress").iterdir()) == []
+
+
+def test_odata_incremental_only_fetches_chunks_not_in_pmd(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    session = _ChunkedSession(months=[202103, 202101, 202102])
+    df = _chunked_downloadable(session).as_pandas(
+        incremental=True, pmd_chunks=["http://reference.data.gov.uk/id/month/2021-01"]
+    )
+    assert session.filters == ["MonthId eq 202102", "MonthId eq 202103"]
+    assert list(df["MonthId"]) == [202102, 202103]
+    assert df.attrs["skipped_chunks"] == [202101]
@@ -0,0 +1,110 @@
+import gzip
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from rdflib import URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import DCTERMS
+from rdflib.graph import Dataset as RDFDataset
+
+from gssutils.metadata import PMDCAT, dcat, namespaces, pmdcat
+from gssutils.metadata.quads import CatalogWriter, write_nquads, write_trig
+
+GRAPH = "http://gss-data.org.uk/graph/trade-metadata"
+
+
+def _catalog() -> dcat.Catalog:
+    dataset = pmdcat.Dataset("https://www.uktradeinfo.com/trade-data")
+    dataset.uri = "http://gss-data.org.uk/data/trade"
+    dataset.set_containing_graph(GRAPH)
+    dataset.title = 'Overseas "trade"\nstatistics'
+    dataset.issued = datetime(2021, 1, 14, 9, 30)
+    dataset.keyword = ["trade", "imports\\exports"]
+    distributions = []
+    for month in ["2020-11", "2020-12"]:
+        distribution = dcat.Distribution(SimpleNamespace(session=None, seed=None))
+        distribution.downloadURL = f"https://www.uktradeinfo.com/files/ots-{month}.csv"
+        distribution.mediaType = "text/csv"
+        distribution.title = f"OTS {month}"
+        distributions.append(distribution)
+    dataset.distribution = distributions
+    catalog = dcat.Catalog()
+    catalog.uri = "http://gss-data.org.uk/catalog/datasets"
+    catalog.set_containing_graph(GRAPH)
+    catalog.record = pmdcat.CatalogRecord()
+    catalog.record.uri = "http://gss-data.org.uk/data/trade-catalog-record"
+    catalog.record.set_containing_graph(GRAPH)
+    catalog.record.primaryTopic = dataset
+    return catalog
+
+
+def _rdflib_dataset(catalog: dcat.Catalog) -> RDFDataset:
+    quads = RDFDataset()
+    quads.namespace_manager = namespaces
+    catalog.add_to_dataset(quads)
+    return quads
+
+
+def _parsed(data: str, format: str) -> RDFDataset:
+    dataset = RDFDataset()
+    dataset.parse(data=data, format=format)
+    return dataset
+
+
+def _quad_set(dataset: RDFDataset) -> set:
+    return {(s, p, o, getattr(g, "identifier", g)) for s, p, o, g in dataset.quads()}
+
+
+def test_written_metadata_is_isomorphic_to_rdflib_serialization():
+    catalog = _catalog()
+    expected = _parsed(_rdflib_dataset(catalog).serialize(format="trig", encoding="utf-8").decode(), "trig")
+
+    trig = write_trig(catalog.quads(), namespaces)
+    assert "@prefix dcat: <http://www.w3.org/ns/dcat#> ." in trig
+    for written in [_parsed(trig, "trig"), _parsed(write_nquads(catalog.quads()), "nquads")]:
+        assert _quad_set(written) == _quad_set(expected)
+        assert isomorphic(written.graph(GRAPH), expected.graph(GRAPH))
+
+
+def test_statements_are_written_once():
+    catalog = _catalog()
+    nquads = write_nquads(list(catalog.quads()) * 2)
+    assert len(nquads.splitlines()) == len(set(catalog.quads()))
+
+
+def test_property_tables_are_compiled_per_class():
+    assert pmdcat.Dataset._rdf_types == (PMDCAT.Dataset,)
+    assert "metadataGraph" in pmdcat.Dataset._compiled_properties
+    assert "metadataGraph" not in dcat.Dataset._compiled_properties
+    # both declared as dct:rights, only one of them set
+    distribution = dcat.Distribution(SimpleNamespace(session=None, seed=None))
+    distribution.rights = "https://www.nationalarchives.gov.uk/doc/open-government-licence/version/3/"
+    assert distribution.get_property(DCTERMS.rights) == URIRef(distribution.rights)
+
+
+def test_catalog_writer_combines_scrapes(tmp_path):
+    first, second = _catalog(), _catalog()
+    second.record.uri = "http://gss-data.org.uk/data/trade-services-catalog-record"
+    second.record.primaryTopic.uri = "http://gss-data.org.uk/data/trade-services"
+    scrapers = [SimpleNamespace(catalog_quads=lambda catalog_id=None, c=c: c.quads()) for c in [first, second]]
+    expected = set(first.quads()) | set(second.quads())
+
+    for name in ["catalog.nq", "catalog.trig.gz"]:
+        with CatalogWriter(tmp_path / name, namespaces) as writer:
+            for scraper in scrapers:
+                writer.add(scraper)
+        if name.endswith(".gz"):
+            with gzip.open(tmp_path / name, "rt", encoding="utf-8") as f:
+                written = f.read()
+        else:
+            written = (tmp_path / name).read_text(encoding="utf-8")
+        assert _quad_set(_parsed(written, "nquads" if name.endswith(".nq") else "trig")) == expected
+        # the catalog's own statements are shared by both scrapes, but written once
+        assert written.count(" dcat:Catalog ." if writer.trig else f" <{dcat.DCAT.Catalog}> ") == 1
+        # and are all that's remembered between scrapes
+        assert {s for s, p, o, g in writer._catalog_statements} == {URIRef(first.uri)}
+
+    for name in ["catalog.json", "catalog", "catalog.gz"]:
+        with pytest.raises(ValueError):
+            CatalogWriter(tmp_path / name)
@@ -0,0 +1,115 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from click.testing import CliRunner
+from rdflib import RDF, URIRef
+
+from gssutils import scrapecli
+from gssutils.metadata import DCAT
+
+ONS = "https://www.ons.gov.uk/economy/inflationandpriceindices/datasets/consumerpriceinflation"
+ONS_AGAIN = "https://www.ons.gov.uk/economy/inflationandpriceindices/datasets/cpih"
+BROKEN = "https://www.ons.gov.uk/broken"
+
+
+class _Scraper:
+    """Stands in for Scraper, every source scraping to a dataset with the same title."""
+
+    scraped = []
+
+    def __init__(self, uri=None, seed=None):
+        if uri == BROKEN:
+            raise ValueError("Unable to scrape")
+        self.uri = uri
+        self.seed = None
+        self.dataset = SimpleNamespace(title="Consumer price inflation", issued="2021-03-24")
+        self.distributions = []
+        _Scraper.scraped.append(uri)
+
+    def fingerprint(self):
+        return {"documents": {self.uri: {"etag": '"v1"'}}, "distributions": "abc"}
+
+    def has_changed_since(self, previous_state):
+        return previous_state != self.fingerprint()
+
+    @staticmethod
+    def sources_unchanged_since(previous_state):
+        return previous_state is not None and previous_state.get("revalidates", False)
+
+    def download_report(self):
+        return {"requests": 2, "cache_hits": 1, "cache_hit_ratio": 0.5}
+
+    def catalog_quads(self):
+        return [(URIRef(self.uri), RDF.type, DCAT.Dataset, URIRef(self.uri))]
+
+    def generate_trig(self):
+        return f"<{self.uri}> a <http://www.w3.org/ns/dcat#Dataset> .\n".encode("utf-8")
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    monkeypatch.setattr(scrapecli, "Scraper", _Scraper)
+    _Scraper.scraped = []
+    runner = CliRunner(mix_stderr=False)
+    with runner.isolated_filesystem():
+        yield runner
+
+
+def _summaries(path="summary.jsonl"):
+    with open(path) as f:
+        return {s["source"]: s for s in map(json.loads, f)}
+
+
+def test_summary_and_failures(runner):
+    result = runner.invoke(
+        scrapecli.entry_point, ["--threads", "--summary", "summary.jsonl", ONS, ONS_AGAIN, BROKEN]
+    )
+    assert result.exit_code == 1
+    assert "1 of 3 scrapes failed." in result.stderr
+
+    summaries = _summaries()
+    assert summaries[BROKEN]["error"] == "ValueError: Unable to scrape"
+    assert summaries[ONS]["title"] == "Consumer price inflation"
+    assert (summaries[ONS]["requests"], summaries[ONS]["cache_hit_ratio"]) == (2, 0.5)
+    assert (summaries[BROKEN]["requests"], summaries[BROKEN]["cache_hit_ratio"]) == (0, None)
+    # the same title, but each source gets its own TriG
+    assert summaries[ONS]["trig"] != summaries[ONS_AGAIN]["trig"]
+    with open(summaries[ONS_AGAIN]["trig"]) as trig:
+        assert ONS_AGAIN in trig.read()
+
+
+def test_state_and_only_changed(runner):
+    args = ["--threads", "--state", "state.json", "--summary", "summary.jsonl"]
+    assert runner.invoke(scrapecli.entry_point, args + [ONS, ONS_AGAIN]).exit_code == 0
+    with open("state.json") as f:
+        state = json.load(f)
+    assert state[ONS] == _Scraper(ONS).fingerprint()
+
+    # ONS_AGAIN revalidates without scraping, ONS is scraped and found unchanged
+    state[ONS_AGAIN]["revalidates"] = True
+    with open("state.json", "w") as f:
+        json.dump(state, f)
+    _Scraper.scraped = []
+    assert runner.invoke(scrapecli.entry_point, args + ["--only-changed", ONS, ONS_AGAIN]).exit_code == 0
+    assert _Scraper.scraped == [ONS]
+    summaries = _summaries()
+    assert summaries[ONS]["unchanged"] and summaries[ONS_AGAIN]["unchanged"]
+    assert "trig" not in summaries[ONS]
+
+    result = runner.invoke(scrapecli.entry_point, ["--only-changed", ONS])
+    assert result.exit_code == 2
+    assert "--only-changed needs a --state file" in result.stderr
+
+
+def test_catalog(runner):
+    result = runner.invoke(scrapecli.entry_point, ["--threads", "--catalog", "catalog.nq", ONS, ONS_AGAIN])
+    assert result.exit_code == 0
+    with open("catalog.nq") as catalog:
+        assert len(catalog.read().splitlines()) == 2
+
+    result = runner.invoke(
+        scrapecli.entry_point, ["--catalog", "catalog.nq", "--state", "state.json", "--only-changed", ONS]
+    )
+    assert result.exit_code == 2
+    assert "--only-changed can't be used with --catalog" in result.stderr
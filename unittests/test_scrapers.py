@@ -0,0 +1,48 @@
+import copy
+import os.path
+
+import pytest
+
+from gssutils import scrapers
+from gssutils.scrapers import LazyScraper, PrefixTrie, ScraperInput, lookup, register, required_input, requires
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # so scrapers registered by a test don't outlive it
+    monkeypatch.setattr(scrapers, "_registry", copy.deepcopy(scrapers._registry))
+    monkeypatch.setattr(scrapers, "scraper_list", scrapers._ScraperList(scrapers.scraper_list))
+
+
+def test_longest_prefix_wins():
+    trie = PrefixTrie()
+    trie.insert("https://www.gov.uk/", "general")
+    trie.insert("https://www.gov.uk/government/statistics/", "specific")
+    assert trie.longest_match("https://www.gov.uk/government/statistics/alcohol-bulletin") == "specific"
+    assert trie.longest_match("https://www.gov.uk/government/publications/x") == "general"
+    assert trie.longest_match("https://example.org/") is None
+
+
+def test_registered_references_are_imported_on_lookup(registry):
+    register("https://scrapers.example.org/", "os.path:join")
+    assert lookup("https://scrapers.example.org/dataset") is os.path.join
+    assert repr(LazyScraper("os.path:join")) == "LazyScraper('os.path:join')"
+
+
+def test_scrapers_appended_to_the_list_are_registered(registry):
+    scrapers.scraper_list.append(("https://www.ons.gov.uk/peoplepopulationandcommunity/", os.path.split))
+    assert lookup("https://www.ons.gov.uk/peoplepopulationandcommunity/births") is os.path.split
+    scrapers.scraper_list += [("https://scrapers.example.org/", os.path.join)]
+    assert lookup("https://scrapers.example.org/dataset") is os.path.join
+
+
+def test_scrapers_default_to_needing_the_parsed_tree():
+    @requires(ScraperInput.NOTHING)
+    def json_scraper(scraper, tree):
+        pass
+
+    def html_scraper(scraper, tree):
+        pass
+
+    assert required_input(json_scraper) == ScraperInput.NOTHING
+    assert required_input(html_scraper) == ScraperInput.TREE
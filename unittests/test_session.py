@@ -0,0 +1,141 @@
+from io import BytesIO
+
+import pytest
+import requests
+from urllib3 import HTTPResponse
+
+from gssutils.session import (
+    BLOB_THRESHOLD,
+    BlobSerializer,
+    DownloadRecord,
+    ScraperSession,
+    SessionPool,
+    cached_blob_path,
+)
+
+
+def test_sessions_are_shared_per_cache_dir(tmp_path):
+    with SessionPool() as pool:
+        session = pool.get(cache_dir=str(tmp_path / "cache"))
+        assert pool.get(cache_dir=str(tmp_path / "cache")) is session
+        assert pool.get(cache_dir=str(tmp_path / "other")) is not session
+        assert len(pool) == 2
+    assert len(pool) == 0
+
+
+def test_adapter_pool_size_is_applied(tmp_path):
+    with SessionPool() as pool:
+        session = pool.get(cache_dir=str(tmp_path), pool_maxsize=4)
+        adapter = session.get_adapter("https://www.ons.gov.uk/")
+        assert adapter._pool_maxsize == 4
+
+
+def test_large_bodies_are_served_from_a_blob(tmp_path):
+    body = b"x" * (BLOB_THRESHOLD + 1)
+    serializer = BlobSerializer(tmp_path / "blobs")
+    request = requests.Request("GET", "https://www.ons.gov.uk/file").prepare()
+    response = HTTPResponse(
+        body=BytesIO(body), headers={"Content-Length": str(len(body))}, status=200, preload_content=False
+    )
+
+    cached = serializer.loads(request, serializer.dumps(request, response, body))
+
+    assert len(list((tmp_path / "blobs").iterdir())) == 1
+    assert not isinstance(cached._fp, BytesIO)
+    blob_path = cached_blob_path(cached)
+    assert blob_path.parent == tmp_path / "blobs"
+    assert cached.read() == body
+    assert cached_blob_path(cached) is None  # already read from
+
+
+class _ValidatorsAdapter(requests.adapters.BaseAdapter):
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.headers["ETag"] = '"abc"'
+        response.headers["Last-Modified"] = "Wed, 01 Sep 2021 09:30:00 GMT"
+        response.raw = BytesIO(b"0123456789")
+        return response
+
+    def close(self):
+        pass
+
+
+def test_scraper_session_records_validators_while_recording():
+    session = requests.Session()
+    session.mount("https://", _ValidatorsAdapter())
+    scraper_session = ScraperSession(session)
+    scraper_session.get("https://www.ons.gov.uk/page")
+    scraper_session.recording = False
+    scraper_session.get("https://www.ons.gov.uk/other")
+    assert scraper_session.documents == {
+        "https://www.ons.gov.uk/page": {"etag": '"abc"', "last_modified": "Wed, 01 Sep 2021 09:30:00 GMT"}
+    }
+    assert isinstance(scraper_session, requests.Session)
+    assert scraper_session.hooks is session.hooks
+    assert scraper_session.get_adapter("https://www.ons.gov.uk/") is session.get_adapter("https://www.ons.gov.uk/")
+
+
+def test_closing_a_scraper_session_leaves_the_shared_session_open():
+    adapter = _ValidatorsAdapter()
+    adapter.close = lambda: pytest.fail("closed the shared adapter")
+    session = requests.Session()
+    session.mount("https://", adapter)
+    with ScraperSession(session) as scraper_session:
+        scraper_session.get("https://www.ons.gov.uk/page")
+    assert session.get("https://www.ons.gov.uk/page").status_code == 200
+
+
+def test_scraper_session_accounts_for_downloads():
+    session = requests.Session()
+    session.mount("https://", _ValidatorsAdapter())
+    completed = []
+    scraper_session = ScraperSession(session, metrics_callback=completed.append)
+
+    scraper_session.get("https://www.ons.gov.uk/page")
+    stream = scraper_session.get("https://www.ons.gov.uk/file.csv", stream=True).raw
+    assert [record.url for record in completed] == ["https://www.ons.gov.uk/page"]
+    assert stream.read(4) == b"0123"
+    with stream:
+        stream.read()
+
+    assert [record.bytes for record in completed] == [10, 10]
+    assert all(isinstance(record, DownloadRecord) and record.complete for record in completed)
+    report = scraper_session.download_report()
+    assert report["requests"] == 2
+    assert report["bytes"] == 20
+    assert report["cache_hits"] == 0
+    assert report["network_bytes"] == 20
+
+
+class _BlobAdapter(requests.adapters.BaseAdapter):
+    def __init__(self, blob_path):
+        super().__init__()
+        self.blob_path = blob_path
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.raw = HTTPResponse(body=open(self.blob_path, "rb"), status=200, preload_content=False)
+        response.from_cache = True
+        return response
+
+    def close(self):
+        pass
+
+
+def test_scraper_session_counts_blobs_opened_in_place(tmp_path):
+    blob_path = tmp_path / "blob"
+    blob_path.write_bytes(b"x" * 100)
+    session = requests.Session()
+    session.mount("https://", _BlobAdapter(blob_path))
+    scraper_session = ScraperSession(session)
+
+    with scraper_session.get("https://www.ons.gov.uk/file.xlsx", stream=True).raw as stream:
+        assert cached_blob_path(stream) == blob_path
+    with scraper_session.get("https://www.ons.gov.uk/file.xlsx", stream=True).raw as stream:
+        assert stream.read() == b"x" * 100
+
+    assert [d["bytes"] for d in scraper_session.download_report()["downloads"]] == [100, 100]
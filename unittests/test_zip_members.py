@@ -0,0 +1,42 @@
+import io
+import zipfile
+
+import pandas as pd
+
+from gssutils.metadata.mimetype import CSV, ZIP
+from gssutils.transform.download import Downloadable
+
+
+class _Response(io.BytesIO):
+    headers = {}
+
+
+class _ZipDownloadable(Downloadable):
+    def __init__(self, body: bytes):
+        super().__init__()
+        self.uri = "https://www.uktradeinfo.com/files/rts.zip"
+        self._mediaType = ZIP
+        self._body = body
+
+    def open(self):
+        return _Response(self._body)
+
+
+def _zipped(files: dict) -> bytes:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return archive.getvalue()
+
+
+def test_zip_members_are_listed_and_loaded_individually():
+    csv = b"MonthId,Value\n202101,1\n202102,2\n"
+    members = _ZipDownloadable(_zipped({"data/rts.csv": csv, "README.txt": b"notes"})).members()
+
+    assert [(m.name, m.size) for m in members] == [("data/rts.csv", len(csv)), ("README.txt", 5)]
+    rts = members[0]
+    assert rts._mediaType == CSV
+    assert rts.uri == "https://www.uktradeinfo.com/files/rts.zip#data/rts.csv"
+    assert rts.as_pandas().equals(pd.DataFrame({"MonthId": [202101, 202102], "Value": [1, 2]}))
+    assert [len(chunk) for chunk in rts.iter_pandas(chunksize=1)] == [1, 1]